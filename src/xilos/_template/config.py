@@ -2,7 +2,7 @@ import random
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 import numpy as np
 from loguru import logger
@@ -13,6 +13,12 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 NOW = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+
+def timestamp() -> str:
+    """The current time as in NOW, with microseconds: for names that must differ on every call."""
+    return datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+
 LOG_TYPES = Literal["TRACE", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 
 MODEL_DIR: Path = Path("./models")
@@ -30,10 +36,76 @@ class ProjectConfig(BaseSettings):
     LOG_LEVEL: LOG_TYPES = "INFO"
 
     MODEL_PATH: str = (MODEL_DIR / f"{NOW}_model").as_posix()
+    MODEL_MMAP: bool = False
     PROCESSOR_PATH: str = (DATA_DIR / f"{NOW}_processor").as_posix()
+    ARTIFACT_POLL_SECONDS: float = 5.0
+    MODEL_REPOSITORY_DIR: str = MODEL_DIR.as_posix()
+    MODEL_MEMORY_BUDGET_MB: float = 2048.0
+    SHADOW_MODEL_PATH: str = ""
+    SHADOW_PROCESSOR_PATH: str = ""
+    SHADOW_SAMPLE_RATE: float = 0.1
+    SHADOW_QUEUE_SIZE: int = 1_000
+
+    TRAIN_DATA_PATH: str = ""
+    TRAIN_DATA_VERSION: str = ""
+    TRAIN_CACHE: bool = True
+    TRAIN_CACHE_DIR: str = (ARTIFACTS_DIR / "stage_cache").as_posix()
+    TRAIN_CACHE_MAX_GB: float = 20.0
+    TRAIN_CACHE_MAX_AGE_DAYS: float = 30.0
+    TRAIN_TARGET: str = "target"
+    TRAIN_STREAMING: bool = False
+    TRAIN_BATCH_ROWS: int = 100_000
+    TRAIN_EPOCHS: int = 1
+    TRAIN_COMPACT_DTYPES: bool = False
+    TRAIN_COMPACT_CATEGORY_RATIO: float = 0.5
+    TRAIN_COMPACT_FLOAT32: bool = True
+    TRAIN_INCREMENTAL: bool = False
+    TRAIN_MODEL_NAME: str = "model"
+    TRAIN_PARTITION_COLUMN: str = "date"
+    TUNE: bool = False
+    TUNE_PARAM_SPACE: dict[str, list[Any]] = {}
+    TUNE_CANDIDATES: int = 32
+    TUNE_CV_FOLDS: int = 5
+    TUNE_FACTOR: int = 3
+    TUNE_RESOURCE: str = "n_samples"
+    TUNE_SCORING: str | None = None
+    TUNE_N_JOBS: int = -1
 
     SERVE_HOST: str = ""
     SERVE_PORT: int = 8000
+    SERVE_WORKERS: int = 1
+    SERVE_ASYNC: bool = False
+    SERVE_COMPILED: bool = False
+    SERVE_ADMISSION: bool = False
+    SERVE_MAX_CONCURRENCY: int = 8
+    SERVE_MAX_QUEUE: int = 64
+    SERVE_QUEUE_TIMEOUT_SECONDS: float = 1.0
+    SERVE_RETRY_AFTER_SECONDS: float = 1.0
+    SERVE_REQUEST_TIMEOUT_MS: float = 0.0
+    SERVE_SINGLEFLIGHT: bool = False
+    SERVE_SINGLEFLIGHT_MAX_KEYS: int = 1_024
+    SERVE_INFERENCE_WORKERS: int = 4
+    SERVE_PROCESS_WORKERS: int = 0
+    SERVE_WARMUP_ROWS: int = 64
+    SERVE_WARMUP_ITERATIONS: int = 3
+    SERVE_WARMUP_PATH: str = ""
+    SERVE_MAX_BODY_MB: float = 64.0
+    SERVE_STREAM_CHUNK_ROWS: int = 10_000
+    SERVE_STREAM_MAX_LINE_BYTES: int = 1_048_576
+    SERVE_CACHE: bool = False
+    SERVE_CACHE_MAX_MB: float = 64.0
+    SERVE_CACHE_TTL_SECONDS: float = 300.0
+    SERVE_LOG_SINK: Literal["none", "table", "parquet"] = "none"
+    SERVE_LOG_DESTINATION: str = (ARTIFACTS_DIR / "prediction_logs").as_posix()
+    SERVE_LOG_QUEUE_SIZE: int = 10_000
+    SERVE_LOG_QUEUE_MB: float = 64.0
+    SERVE_LOG_MAX_ROWS: int = 100
+    SERVE_LOG_BATCH_SIZE: int = 500
+    SERVE_LOG_FLUSH_SECONDS: float = 5.0
+    SERVE_LOG_SAMPLE_RATE: float = 1.0
+    SERVE_BATCHING: bool = False
+    SERVE_BATCH_MAX_ROWS: int = 1024
+    SERVE_BATCH_MAX_WAIT_MS: float = 5.0
 
     RANDOM_SEED: int = 42
 
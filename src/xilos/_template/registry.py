@@ -1,16 +1,25 @@
-from collections.abc import Generator
-from contextlib import contextmanager
+import functools
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
 
 from fastapi import Request
 from loguru import logger
-from pydantic import BaseModel
-from sklearn.base import ClassifierMixin
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
-from .settings import project_config
+from .config import project_config
+from .xcore.xmodel import version_key
+from .xcore.xprocessor import DataProcessor
 from .xcore.xstore import DataStorage, DataTable
-from .xtrain.model import MLModel
-from .xtrain.processor import DataProcessor
-from .xtrain.processor.example import ExampleProcessor
+from .xtrain.model import MLModel, ServingModel
+from .xtrain.processor.processor import ExampleProcessor
 
 
 def _parse_project_providers() -> tuple[DataStorage, DataTable]:
@@ -42,53 +51,412 @@ def _parse_project_providers() -> tuple[DataStorage, DataTable]:
     raise ImportError("No cloud provider configuration found.")
 
 
+class ResidentArtifact:
+    """
+    Keeps a deserialized artifact resident in process memory.
+
+    Readers get the current object without touching the disk. `refresh` reloads the
+    file when its mtime/size changed and its content hash differs from the resident
+    version, then swaps the new object in with a single reference assignment.
+    """
+
+    def __init__(self, name: str, path: str, loader: Callable[[str], Any]) -> None:
+        self.name = name
+        self.path = path
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._current: tuple[Any, int] = (None, 0)
+        self._signature: tuple[int, int] | None = None
+        self._digest: str | None = None
+
+    @property
+    def value(self) -> Any:
+        return self._current[0]
+
+    @property
+    def version(self) -> int:
+        return self._current[1]
+
+    @property
+    def loader(self) -> Callable[[str], Any]:
+        return self._loader
+
+    def snapshot(self) -> tuple[Any, int]:
+        """Return the resident object together with its version number."""
+        return self._current
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self) -> bool:
+        """Load the artifact if it changed on disk. Returns True when a new version was swapped in."""
+        with self._lock:
+            signature = self._stat()
+            if signature is None or signature == self._signature:
+                return False
+
+            try:
+                with open(self.path, "rb") as f:
+                    digest = hashlib.file_digest(f, "blake2b").hexdigest()
+                if digest == self._digest:
+                    self._signature = signature
+                    return False
+
+                obj = self._loader(self.path)
+
+            except Exception as e:
+                # Keep serving the resident version; the load is retried once the file changes again.
+                logger.error(f"Failed to load {self.name} from {self.path}: {e}")
+                self._signature = signature
+                return False
+
+            self._current = (obj, self._current[1] + 1)
+            self._signature, self._digest = signature, digest
+
+        logger.info(f"{self.name.capitalize()} v{self.version} loaded from {self.path}")
+        return True
+
+
+class ModelNotFoundError(LookupError):
+    """Raised when a named model or version does not exist in the model repository."""
+
+
+@dataclass
+class LoadedModel:
+    name: str
+    version: str
+    model: MLModel
+    processor: DataProcessor | None
+    nbytes: int
+
+
+_SEGMENT = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+class ModelRepository:
+    """
+    Named, versioned models loaded lazily from `root/<name>/<version>/`.
+
+    Each version directory holds a `model` artifact and optionally a `processor` artifact.
+    The `latest` alias resolves to the highest version name, comparing numbers in names
+    numerically (`version_key`); any other alias can be a symlink to a version directory.
+    Resident models are kept in LRU order and evicted once their on-disk size exceeds
+    `budget_bytes`. Concurrent requests for a cold model share a single load.
+
+    Resolved references are cached, so a request for a resident model touches no files;
+    the first request for a reference resolves it on the loader, and `refresh_aliases`
+    (run by the artifact watcher) picks up newly published versions.
+    """
+
+    LATEST = "latest"
+
+    def __init__(
+        self,
+        root: str | Path,
+        model_loader: Callable[[str], MLModel],
+        processor_loader: Callable[[str], DataProcessor],
+        budget_bytes: int,
+        load_workers: int = 2,
+    ) -> None:
+        self.root = Path(root)
+        self.model_loader = model_loader
+        self.processor_loader = processor_loader
+        self.budget_bytes = budget_bytes
+
+        self._lock = threading.Lock()
+        self._resident: OrderedDict[tuple[str, str], LoadedModel] = OrderedDict()
+        self._loading: dict[tuple[str, str], Future] = {}
+        self._aliases: dict[tuple[str, str], tuple[str, str]] = {}
+        self._loader = ThreadPoolExecutor(max_workers=load_workers, thread_name_prefix="xserve-model-loader")
+        self._resident_bytes = 0
+
+        self.loads = 0
+        self.evictions = 0
+
+    def resolve(self, name: str, version: str) -> tuple[str, str]:
+        """Map a model name and version or alias to the concrete version directory."""
+        if not _SEGMENT.match(name) or not _SEGMENT.match(version):
+            raise ModelNotFoundError(f"Invalid model reference {name}/{version}")
+
+        model_dir = self.root / name
+        if version == self.LATEST:
+            versions = []
+            if model_dir.is_dir():
+                # Symlinked aliases and hidden (e.g. staging) directories never shadow real versions.
+                versions = sorted(
+                    (
+                        p.name
+                        for p in model_dir.iterdir()
+                        if not p.is_symlink() and not p.name.startswith(".") and (p / "model").is_file()
+                    ),
+                    key=version_key,
+                )
+            if not versions:
+                raise ModelNotFoundError(f"No versions found for model {name}")
+            return name, versions[-1]
+
+        version_dir = (model_dir / version).resolve()
+        if version_dir.parent != model_dir.resolve() or not (version_dir / "model").is_file():
+            raise ModelNotFoundError(f"Model {name}/{version} not found")
+        return name, version_dir.name
+
+    def acquire(self, name: str, version: str) -> Future:
+        """Return a future for the resident model, starting at most one load per version."""
+        if not _SEGMENT.match(name) or not _SEGMENT.match(version):
+            raise ModelNotFoundError(f"Invalid model reference {name}/{version}")
+
+        with self._lock:
+            key = self._aliases.get((name, version))
+            if key is not None:
+                return self._acquire(key)
+        return self._loader.submit(self._resolve_and_load, name, version)
+
+    def _acquire(self, key: tuple[str, str]) -> Future:
+        # Called with the lock held.
+        entry = self._resident.get(key)
+        if entry is not None:
+            self._resident.move_to_end(key)
+            future: Future = Future()
+            future.set_result(entry)
+            return future
+
+        future = self._loading.get(key)
+        if future is None:
+            future = self._loader.submit(self._load, key)
+            self._loading[key] = future
+        return future
+
+    def _resolve_and_load(self, name: str, version: str) -> LoadedModel:
+        key = self.resolve(name, version)
+        with self._lock:
+            self._aliases[(name, version)] = key
+            entry = self._resident.get(key)
+            if entry is not None:
+                self._resident.move_to_end(key)
+                return entry
+            future = self._loading.get(key)
+            if future is None:
+                # Load on this thread: waiting on another loader task could exhaust the pool.
+                future = Future()
+                self._loading[key] = future
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            # Submitted before this task, so the FIFO loader is already running it.
+            return future.result()
+        try:
+            entry = self._load(key)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        future.set_result(entry)
+        return entry
+
+    def refresh_aliases(self) -> None:
+        """Re-resolve every cached reference, e.g. to move `latest` to a newly published version."""
+        with self._lock:
+            references = list(self._aliases)
+
+        for name, version in references:
+            try:
+                key = self.resolve(name, version)
+            except ModelNotFoundError:
+                key = None
+            with self._lock:
+                if key is None:
+                    self._aliases.pop((name, version), None)
+                else:
+                    self._aliases[(name, version)] = key
+
+    def get(self, name: str, version: str) -> LoadedModel:
+        return self.acquire(name, version).result()
+
+    def _load(self, key: tuple[str, str]) -> LoadedModel:
+        name, version = key
+        version_dir = self.root / name / version
+        model_path = version_dir / "model"
+        processor_path = version_dir / "processor"
+
+        try:
+            model = self.model_loader(model_path.as_posix())
+            processor = self.processor_loader(processor_path.as_posix()) if processor_path.is_file() else None
+            nbytes = model_path.stat().st_size + (processor_path.stat().st_size if processor is not None else 0)
+            entry = LoadedModel(name=name, version=version, model=model, processor=processor, nbytes=nbytes)
+
+            with self._lock:
+                self._resident[key] = entry
+                self._resident_bytes += nbytes
+                self.loads += 1
+                self._evict(keep=key)
+
+            logger.info(f"Model {name}/{version} loaded ({nbytes / 1024**2:.1f} MB)")
+            return entry
+
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def _evict(self, keep: tuple[str, str]) -> None:
+        while self._resident_bytes > self.budget_bytes and len(self._resident) > 1:
+            key, entry = next(iter(self._resident.items()))
+            if key == keep:
+                break
+            del self._resident[key]
+            self._resident_bytes -= entry.nbytes
+            self.evictions += 1
+            logger.info(f"Model {entry.name}/{entry.version} evicted to stay within the memory budget")
+
+    def shutdown(self) -> None:
+        self._loader.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "resident": [f"{name}/{version}" for name, version in self._resident],
+            "resident_bytes": self._resident_bytes,
+            "budget_bytes": self.budget_bytes,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
+
+
 class ProviderRegistry(BaseModel):
-    model: type[ClassifierMixin,]
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model: type[MLModel]
     processor: type[DataProcessor]
     storage_provider: DataStorage
     table_provider: DataTable
 
-    @contextmanager
-    def get_model(self, request: Request) -> Generator[MLModel, None, None]:
-        import os
+    _model_artifact: ResidentArtifact = PrivateAttr()
+    _processor_artifact: ResidentArtifact = PrivateAttr()
+    _shadow_model_artifact: ResidentArtifact | None = PrivateAttr(default=None)
+    _shadow_processor_artifact: ResidentArtifact | None = PrivateAttr(default=None)
+    _stop_event: threading.Event = PrivateAttr(default_factory=threading.Event)
+    _watcher: threading.Thread | None = PrivateAttr(default=None)
+    _repository: ModelRepository = PrivateAttr()
+    _reload_listeners: list[tuple[Callable[[], None], tuple[ResidentArtifact, ...]]] = PrivateAttr(default_factory=list)
 
-        mp = project_config.MODEL_PATH
-        if os.path.exists(mp):
-            model = self.model.load(mp)
-            logger.info(f"Model loaded from {mp}")
-            yield model
-            del model
+    def model_post_init(self, __context: Any) -> None:
+        # Memory-mapped weights are shared read-only between uvicorn workers through the page cache.
+        model_loader = self.model.load
+        if project_config.MODEL_MMAP:
+            model_loader = functools.partial(self.model.load, mmap_mode="r")
 
-        else:
-            logger.warning(
-                f"Model file not found at {mp}. Predictions will fail.",
+        self._model_artifact = ResidentArtifact("model", project_config.MODEL_PATH, model_loader)
+        self._processor_artifact = ResidentArtifact("processor", project_config.PROCESSOR_PATH, self.processor.load)
+        if project_config.SHADOW_MODEL_PATH:
+            self._shadow_model_artifact = ResidentArtifact(
+                "shadow model", project_config.SHADOW_MODEL_PATH, model_loader
             )
+        if project_config.SHADOW_PROCESSOR_PATH:
+            self._shadow_processor_artifact = ResidentArtifact(
+                "shadow processor", project_config.SHADOW_PROCESSOR_PATH, self.processor.load
+            )
+        self._repository = ModelRepository(
+            root=project_config.MODEL_REPOSITORY_DIR,
+            model_loader=model_loader,
+            processor_loader=self.processor.load,
+            budget_bytes=int(project_config.MODEL_MEMORY_BUDGET_MB * 1024**2),
+        )
 
-    @contextmanager
-    def get_processor(self, request: Request) -> Generator[DataProcessor, None, None]:
-        try:
-            import os
+    @property
+    def model_artifact(self) -> ResidentArtifact:
+        return self._model_artifact
 
-            pp = project_config.PROCESSOR_PATH
-            if os.path.exists(pp):
-                processor = self.processor.load(pp)
-                logger.info(f"Processor loaded from {pp}")
-                yield processor
-                del processor
+    @property
+    def processor_artifact(self) -> ResidentArtifact:
+        return self._processor_artifact
 
-            else:
-                logger.warning(
-                    f"Processor file not found at {pp}. Predictions will fail.",
-                )
+    @property
+    def shadow_model_artifact(self) -> ResidentArtifact | None:
+        return self._shadow_model_artifact
+
+    @property
+    def shadow_processor_artifact(self) -> ResidentArtifact | None:
+        """Processor for the shadow model; None when it shares the primary processor."""
+        return self._shadow_processor_artifact
+
+    @property
+    def repository(self) -> ModelRepository:
+        return self._repository
+
+    @property
+    def artifacts(self) -> list[ResidentArtifact]:
+        shadow = [self._shadow_model_artifact, self._shadow_processor_artifact]
+        return [self._model_artifact, self._processor_artifact, *[a for a in shadow if a is not None]]
+
+    def add_reload_listener(
+        self,
+        listener: Callable[[], None],
+        artifacts: list[ResidentArtifact] | None = None,
+    ) -> None:
+        """
+        Register a callback run on the refreshing thread after a new version of one of `artifacts`
+        (by default the primary model and processor) is swapped in.
+        """
+        watched = tuple(artifacts) if artifacts is not None else (self._model_artifact, self._processor_artifact)
+        self._reload_listeners.append((listener, watched))
+
+    def refresh(self) -> bool:
+        """Reload every artifact that changed on disk and notify the listeners watching them."""
+        changed = [artifact for artifact in self.artifacts if artifact.refresh()]
+        for listener, watched in self._reload_listeners:
+            if not any(artifact in changed for artifact in watched):
+                continue
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"Reload listener {listener.__name__} failed: {e}")
+        return bool(changed)
 
-        except Exception as e:
-            logger.error(f"Failed to initialize processor: {e}")
+    def start(self) -> None:
+        """Start the background watcher that loads and hot-swaps the artifacts."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._watcher = threading.Thread(target=self._watch, name="xserve-artifact-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self) -> None:
+        while not self._stop_event.is_set():
+            self.refresh()
+            self._repository.refresh_aliases()
+            self._stop_event.wait(project_config.ARTIFACT_POLL_SECONDS)
+
+    async def get_model(self, request: Request) -> MLModel | None:
+        model = self._model_artifact.value
+        if model is None:
+            logger.warning(
+                f"Model not loaded from {self._model_artifact.path}. Predictions will fail.",
+            )
+        return model
+
+    async def get_processor(self, request: Request) -> DataProcessor | None:
+        processor = self._processor_artifact.value
+        if processor is None:
+            logger.warning(
+                f"Processor not loaded from {self._processor_artifact.path}. Predictions will fail.",
+            )
+        return processor
 
 
 storage_provider, table_provider = _parse_project_providers()
 
 registry = ProviderRegistry(
-    model=MLModel,
+    model=ServingModel,
     processor=ExampleProcessor,
     storage_provider=storage_provider,
     table_provider=table_provider,
@@ -1,10 +1,18 @@
 import abc
+import re
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
 
 
+def version_key(name: str) -> tuple:
+    """Sort key for version names: runs of digits compare as numbers, so "10" sorts after "9"."""
+    parts = re.split(r"([0-9]+)", name)
+    # Odd positions hold the digit runs.
+    return tuple((int(part), "") if i % 2 else (-1, part) for i, part in enumerate(parts))
+
+
 class XModel(abc.ABC):
     """Abstract base class for all ML models."""
 
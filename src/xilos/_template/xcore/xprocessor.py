@@ -1,6 +1,9 @@
 import abc
+from pathlib import Path
 
+import joblib
 import pandas as pd
+import polars as pl
 from sklearn.base import TransformerMixin
 
 
@@ -20,3 +23,78 @@ class DataProcessor(abc.ABC, TransformerMixin):
     @abc.abstractmethod
     def transform(self, X):
         """Transform the data"""
+
+    def partial_fit(self, X, y=None):
+        """Update the fitted state with one chunk of data, for datasets that do not fit in memory."""
+        raise NotImplementedError(f"{type(self).__name__} does not support incremental fitting.")
+
+    def save(self, path: str | Path) -> None:
+        """Save the fitted processor to disk."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "DataProcessor":
+        """Load a fitted processor from disk."""
+        return joblib.load(path)
+
+
+class LazyDataProcessor(abc.ABC):
+    """
+    Polars-native processor. Every step maps a LazyFrame to a LazyFrame, so the whole chain is
+    optimized as one query: steps are fused, run multi-threaded, and projections and filters
+    are pushed down to a `pl.scan_parquet` source.
+
+    pandas input (e.g. at serving time) gives pandas output. Its index is carried through the
+    query as the `ROW_INDEX` column, which steps that drop rows must keep.
+
+    It is not a `DataProcessor`, and the training and serving pipelines do not use it yet.
+    """
+
+    ROW_INDEX = "__row_index__"
+
+    @abc.abstractmethod
+    def clean_data(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        """Clean data"""
+
+    @abc.abstractmethod
+    def feature_engineer(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        """Feature engineering"""
+
+    @abc.abstractmethod
+    def fit(self, X: pl.LazyFrame | pl.DataFrame, y=None):
+        """Fit the processor to the data"""
+
+    @abc.abstractmethod
+    def transform_lazy(self, X: pl.LazyFrame) -> pl.LazyFrame:
+        """Build the query that transforms the data"""
+
+    @staticmethod
+    def lazy(X: pl.LazyFrame | pl.DataFrame | pd.DataFrame) -> pl.LazyFrame:
+        """Return the input as a LazyFrame."""
+        if isinstance(X, pd.DataFrame):
+            return pl.from_pandas(X, include_index=False).lazy()
+        return X.lazy()
+
+    def transform(self, X: pl.LazyFrame | pl.DataFrame | pd.DataFrame) -> pl.DataFrame | pd.DataFrame:
+        """Transform the data."""
+        if not isinstance(X, pd.DataFrame):
+            return self.transform_lazy(X.lazy()).collect()
+
+        query = self.lazy(X).with_row_index(self.ROW_INDEX)
+        result = self.transform_lazy(query).collect()
+        positions = result.get_column(self.ROW_INDEX).to_numpy()
+        return result.drop(self.ROW_INDEX).to_pandas().set_axis(X.index[positions])
+
+    def fit_transform(self, X: pl.LazyFrame | pl.DataFrame | pd.DataFrame, y=None):
+        return self.fit(X, y).transform(X)
+
+    def save(self, path: str | Path) -> None:
+        """Save the fitted processor to disk."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LazyDataProcessor":
+        """Load a fitted processor from disk."""
+        return joblib.load(path)
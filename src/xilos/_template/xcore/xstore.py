@@ -1,4 +1,5 @@
 import abc
+from collections.abc import Iterator
 
 import pandas as pd
 import polars as pl
@@ -27,14 +28,14 @@ class DataStorage(abc.ABC):
             temp_name = DATA_DIR / f"temp_{NOW}.parquet"
             self.download_object(
                 cloud_path=cloud_path,
-                file_path=save_path or DATA_DIR / temp_name,
+                file_path=save_path or temp_name,
             )
             df = pl.read_parquet(cloud_path)
 
             if save_path is None:
                 import os
 
-                os.remove(DATA_DIR / temp_name)
+                os.remove(temp_name)
 
             return df
 
@@ -42,6 +43,29 @@ class DataStorage(abc.ABC):
             logger.error(f"S3 fetch failed: {e}")
             raise
 
+    def scan_batches(
+        self,
+        cloud_path: str,
+        batch_rows: int,
+        predicate: pl.Expr | None = None,
+    ) -> Iterator[pl.DataFrame]:
+        """
+        Stream a Parquet dataset (file, glob or directory, local or object store) in chunks of
+        about `batch_rows` rows, without downloading or materializing it.
+
+        A `predicate` is pushed down to the scan: for a Hive-partitioned directory
+        (`key=value/` paths), partitions it excludes are never read.
+        """
+        logger.info(f"Scanning {cloud_path} in batches of {batch_rows} rows")
+        query = pl.scan_parquet(cloud_path)
+        if predicate is not None:
+            query = query.filter(predicate)
+        yield from query.collect_batches(chunk_size=batch_rows)
+
+    def scan_schema(self, cloud_path: str) -> pl.Schema:
+        """Column names and types of a Parquet dataset, Hive partition keys included."""
+        return pl.scan_parquet(cloud_path).collect_schema()
+
     def store_dataframe(
         self,
         data: pl.DataFrame | pd.DataFrame | None,
@@ -0,0 +1,96 @@
+import asyncio
+import math
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, Request
+
+from .metrics import REJECTED
+
+DEADLINE_HEADER = "x-request-timeout-ms"
+
+
+def request_deadline(request: Request, default_timeout_ms: float) -> float | None:
+    """
+    Monotonic deadline for a request, from its `X-Request-Timeout-Ms` header or the default.
+    Returns None when neither sets a budget.
+    """
+    header = request.headers.get(DEADLINE_HEADER)
+    try:
+        timeout_ms = float(header) if header is not None else default_timeout_ms
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid {DEADLINE_HEADER} header: {header}") from e
+    return time.monotonic() + timeout_ms / 1000 if timeout_ms > 0 else None
+
+
+def remaining(deadline: float | None) -> float | None:
+    """Seconds left until `deadline`, for use with `asyncio.timeout`."""
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class AdmissionController:
+    """
+    Bounds the number of requests in the inference path.
+
+    At most `max_concurrency` requests run at once and at most `max_queue` wait for a slot.
+    A request arriving at a full queue is rejected immediately with 429 and a Retry-After
+    header; a queued request is rejected once it waited `queue_timeout_s` (503) or its
+    deadline passed (504), so callers fail fast instead of timing out behind a backlog.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout_s: float, retry_after_s: float) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.retry_after_s = retry_after_s
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    def _reject(self, reason: str, status_code: int, detail: str) -> HTTPException:
+        self.rejected += 1
+        REJECTED.inc(reason=reason)
+        retry_after = str(max(1, math.ceil(self.retry_after_s)))
+        headers = {"Retry-After": retry_after} if status_code in (429, 503) else None
+        return HTTPException(status_code=status_code, detail=detail, headers=headers)
+
+    @asynccontextmanager
+    async def admit(self, deadline: float | None = None) -> AsyncIterator[None]:
+        """Hold an inference slot for the duration of the block."""
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            raise self._reject("queue_full", 429, "Server is overloaded, retry later.")
+
+        timeout = self.queue_timeout_s
+        left = remaining(deadline)
+        if left is not None and left < timeout:
+            timeout = left
+
+        self.waiting += 1
+        try:
+            async with asyncio.timeout(max(timeout, 0)):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            if left is not None and left <= self.queue_timeout_s:
+                raise self._reject("deadline", 504, "Request deadline expired while queued.") from None
+            raise self._reject("queue_timeout", 503, "Timed out waiting for an inference slot.") from None
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
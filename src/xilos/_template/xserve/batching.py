@@ -0,0 +1,228 @@
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+
+@dataclass
+class PendingRequest:
+    request_id: str
+    data: pd.DataFrame
+    future: Future = field(default_factory=Future)
+
+
+class MicroBatcher:
+    """
+    Merges concurrent prediction requests into one DataFrame and scores it with a single
+    transform/predict call.
+
+    A batch is closed when it holds `max_rows` rows or when `max_wait_ms` elapsed since its
+    first request arrived. `infer` returns the predictions and the index labels of the rows
+    they belong to (None when the processor does not keep the index), so predictions are
+    split back to the callers even when the processor drops rows. A row dropped only because
+    it repeats a row of another request in the batch gets that row's prediction, as it would
+    have when scored on its own.
+
+    Up to `workers` batches are scored concurrently, so a pool of inference processes is kept
+    busy; while every worker is busy, requests keep queueing and form the next, larger batch.
+    """
+
+    def __init__(
+        self,
+        infer: Callable[[pd.DataFrame], tuple[np.ndarray, pd.Index | None]],
+        max_rows: int,
+        max_wait_ms: float,
+        workers: int = 1,
+    ) -> None:
+        self.infer = infer
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000
+        self.workers = max(1, workers)
+
+        self._queue: queue.Queue[PendingRequest] = queue.Queue()
+        self._carry: PendingRequest | None = None
+        self._stop_event = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._pool: ThreadPoolExecutor | None = None
+        self._slots = threading.Semaphore(self.workers)
+
+    def start(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="xserve-batch")
+        self._worker = threading.Thread(target=self._run, name="xserve-batcher", daemon=True)
+        self._worker.start()
+        logger.info(
+            f"Micro-batching enabled (max_rows={self.max_rows}, max_wait={self.max_wait * 1000:.1f}ms, "
+            f"workers={self.workers})"
+        )
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        if self._pool is not None:
+            # Batches already handed to the pool are scored and resolved.
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+        pending = [self._carry] if self._carry is not None else []
+        self._carry = None
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for item in pending:
+            if item.future.cancelled():
+                continue
+            item.future.set_exception(RuntimeError("Micro-batcher stopped before the request was scored."))
+
+    def submit(self, request_id: str, data: pd.DataFrame) -> Future:
+        """Queue a request; the returned future resolves to its predictions."""
+        item = PendingRequest(request_id=request_id, data=data)
+        self._queue.put(item)
+        return item.future
+
+    def _next(self, timeout: float) -> PendingRequest | None:
+        if self._carry is not None:
+            item, self._carry = self._carry, None
+            return item
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _collect(self) -> list[PendingRequest]:
+        first = self._next(timeout=0.1)
+        if first is None:
+            return []
+
+        batch = [first]
+        rows = len(first.data)
+        deadline = time.monotonic() + self.max_wait
+
+        while rows < self.max_rows:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            item = self._next(timeout=remaining)
+            if item is None:
+                break
+
+            if rows + len(item.data) > self.max_rows:
+                self._carry = item
+                break
+
+            batch.append(item)
+            rows += len(item.data)
+
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            # Wait for a free worker before collecting, so the batch grows while all are busy.
+            if not self._slots.acquire(timeout=0.1):
+                continue
+            batch = self._collect()
+            if not batch:
+                self._slots.release()
+                continue
+            done = self._pool.submit(self._execute, batch)
+            done.add_done_callback(lambda done, batch=batch: self._finish(batch, done))
+
+    def _finish(self, batch: list[PendingRequest], done: Future) -> None:
+        """Completion callback of a batch: free its worker and fail requests `_execute` left unresolved."""
+        self._slots.release()
+        error = done.exception()
+        if error is None:
+            return
+        logger.error(f"Batch execution failed: {error}")
+        for item in batch:
+            if not item.future.done():
+                item.future.set_exception(error)
+
+    def _execute(self, batch: list[PendingRequest]) -> None:
+        # Requests whose caller gave up (deadline or disconnect) are cancelled and not scored.
+        batch = [item for item in batch if item.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        if len(batch) == 1:
+            self._execute_single(batch[0])
+            return
+
+        frame = pd.concat([item.data for item in batch], ignore_index=True)
+        try:
+            predictions, index = self.infer(frame)
+        except Exception as e:
+            for item in batch:
+                item.future.set_exception(e)
+            return
+
+        results = self._split(batch, frame, predictions, index)
+        if results is None:
+            # The processor changed the row count and did not keep the index, so the merged
+            # output cannot be split back. Score each request on its own.
+            logger.warning("Batched predictions cannot be mapped to the input rows; scoring requests individually.")
+            for item in batch:
+                self._execute_single(item)
+            return
+
+        for item, result in zip(batch, results, strict=True):
+            item.future.set_result(result)
+
+    @staticmethod
+    def _split(
+        batch: list[PendingRequest], frame: pd.DataFrame, predictions: np.ndarray, index: pd.Index | None
+    ) -> list[np.ndarray] | None:
+        """Split the merged predictions per request using the positions of the scored rows."""
+        predictions = np.asarray(predictions)
+        if index is None:
+            if len(predictions) != len(frame):
+                return None
+            positions = np.arange(len(frame))
+        else:
+            positions = frame.index.get_indexer(index)
+            if len(positions) != len(predictions) or (positions < 0).any() or not index.is_unique:
+                return None
+
+        sizes = [len(item.data) for item in batch]
+        values = np.empty((len(frame), *predictions.shape[1:]), dtype=predictions.dtype)
+        values[positions] = predictions
+        scored = np.zeros(len(frame), dtype=bool)
+        scored[positions] = True
+
+        if not scored.all():
+            # Rows repeated within a request are dropped as they would be on their own; the first
+            # copy of a row that was dropped as a repeat of another request's row takes its prediction.
+            hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+            owners = np.repeat(np.arange(len(batch)), sizes)
+            first = ~pd.DataFrame({"owner": owners, "row": hashes}).duplicated().to_numpy()
+            restore = np.flatnonzero(~scored & first)
+            if len(restore):
+                kept = pd.Series(positions, index=hashes[positions])
+                source = kept[~kept.index.duplicated()].reindex(hashes[restore]).to_numpy()
+                found = ~np.isnan(source)
+                values[restore[found]] = values[source[found].astype(np.intp)]
+                scored[restore[found]] = True
+
+        results, offset = [], 0
+        for size in sizes:
+            rows = slice(offset, offset + size)
+            results.append(values[rows][scored[rows]])
+            offset += size
+        return results
+
+    def _execute_single(self, item: PendingRequest) -> None:
+        try:
+            predictions, _ = self.infer(item.data)
+            item.future.set_result(predictions)
+        except Exception as e:
+            item.future.set_exception(e)
@@ -0,0 +1,271 @@
+"""
+Load test for xserve.
+
+Drives the FastAPI app in-process through an ASGI transport, or a running server with
+`--url`, and prints throughput and latency percentiles as JSON so runs can be compared
+between commits:
+
+    python -m xilos.xserve.benchmark --rows 1 64 1024 --concurrency 1 8 32 --output bench.json
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .codecs import ARROW_STREAM_CONTENT_TYPE, JSON_CONTENT_TYPE
+from .streaming import NDJSON_CONTENT_TYPE
+
+
+@dataclass
+class Payload:
+    path: str
+    content: bytes
+    content_type: str
+
+
+def _rows_payload(frame: pd.DataFrame) -> Payload:
+    return Payload("/predict", json.dumps({"data": frame.to_dict(orient="records")}).encode(), JSON_CONTENT_TYPE)
+
+
+def _columns_payload(frame: pd.DataFrame) -> Payload:
+    return Payload("/predict", json.dumps({"columns": frame.to_dict(orient="list")}).encode(), JSON_CONTENT_TYPE)
+
+
+def _arrow_payload(frame: pd.DataFrame) -> Payload:
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return Payload("/predict", sink.getvalue(), ARROW_STREAM_CONTENT_TYPE)
+
+
+def _stream_payload(frame: pd.DataFrame) -> Payload:
+    return Payload("/predict/stream", frame.to_json(orient="records", lines=True).encode(), NDJSON_CONTENT_TYPE)
+
+
+PAYLOAD_KINDS: dict[str, Callable[[pd.DataFrame], Payload]] = {
+    "rows": _rows_payload,
+    "columns": _columns_payload,
+    "arrow": _arrow_payload,
+    "stream": _stream_payload,
+}
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parse a request mix such as `rows=0.7,arrow=0.3` into normalised weights."""
+    weights = {}
+    for part in value.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in PAYLOAD_KINDS:
+            raise argparse.ArgumentTypeError(f"unknown request kind {kind!r}, expected one of {list(PAYLOAD_KINDS)}")
+        weights[kind] = float(weight or 1.0)
+
+    total = sum(weights.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError("request mix weights must sum to a positive number")
+    return {kind: weight / total for kind, weight in weights.items()}
+
+
+def build_frame(columns: list[str], rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.normal(size=(rows, len(columns))), columns=columns)
+
+
+@dataclass
+class RunResult:
+    rows: int
+    concurrency: int
+    mix: dict[str, float]
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    rows_per_s: float
+    latency_ms: dict[str, float]
+    status_codes: dict[str, int] = field(default_factory=dict)
+
+
+def summarize(
+    rows: int,
+    concurrency: int,
+    mix: dict[str, float],
+    latencies: list[float],
+    statuses: list[int],
+    duration: float,
+) -> RunResult:
+    latency_ms = np.asarray(latencies) * 1000
+    ok = sum(1 for status in statuses if status < 400)
+    codes: dict[str, int] = {}
+    for status in statuses:
+        codes[str(status)] = codes.get(str(status), 0) + 1
+
+    return RunResult(
+        rows=rows,
+        concurrency=concurrency,
+        mix=mix,
+        requests=len(statuses),
+        errors=len(statuses) - ok,
+        duration_s=round(duration, 4),
+        throughput_rps=round(ok / duration, 2) if duration else 0.0,
+        rows_per_s=round(ok * rows / duration, 2) if duration else 0.0,
+        latency_ms={
+            "p50": round(float(np.percentile(latency_ms, 50)), 3),
+            "p95": round(float(np.percentile(latency_ms, 95)), 3),
+            "p99": round(float(np.percentile(latency_ms, 99)), 3),
+            "mean": round(float(latency_ms.mean()), 3),
+            "max": round(float(latency_ms.max()), 3),
+        },
+        status_codes=codes,
+    )
+
+
+async def run_level(
+    client: Any,
+    payloads: dict[str, Payload],
+    mix: dict[str, float],
+    rows: int,
+    concurrency: int,
+    requests: int,
+    seed: int,
+) -> RunResult:
+    """Issue `requests` requests from `concurrency` closed-loop workers and summarise them."""
+    rng = random.Random(seed)
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+    latencies: list[float] = []
+    statuses: list[int] = []
+    position = 0
+
+    async def worker() -> None:
+        nonlocal position
+        while position < len(kinds):
+            payload = payloads[kinds[position]]
+            position += 1
+            started = time.perf_counter()
+            try:
+                response = await client.post(
+                    payload.path,
+                    content=payload.content,
+                    headers={"content-type": payload.content_type},
+                )
+                status = response.status_code
+            except Exception:
+                status = 599
+            latencies.append(time.perf_counter() - started)
+            statuses.append(status)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(rows, concurrency, mix, latencies, statuses, time.perf_counter() - started)
+
+
+@asynccontextmanager
+async def open_client(url: str | None, timeout: float) -> AsyncIterator[Any]:
+    """HTTP client for a running server, or an ASGI client wrapping the app with its lifespan."""
+    import httpx
+
+    if url:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+            yield client
+        return
+
+    from .main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://xserve", timeout=timeout) as client:
+            yield client
+
+
+def _input_columns_in_process() -> list[str] | None:
+    from ..registry import registry
+    from .warmup import _input_columns
+
+    processor = registry.processor_artifact.value
+    return _input_columns(processor) if processor is not None else None
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    results = []
+    async with open_client(args.url, args.timeout) as client:
+        columns = args.columns or (None if args.url else _input_columns_in_process())
+        if not columns:
+            raise SystemExit("Feature columns unknown: pass --columns or load a processor that records them.")
+
+        for rows in args.rows:
+            frame = build_frame(columns, rows, args.seed)
+            payloads = {kind: PAYLOAD_KINDS[kind](frame) for kind in args.mix}
+            if args.warmup:
+                await run_level(client, payloads, args.mix, rows, 1, args.warmup, args.seed)
+
+            for concurrency in args.concurrency:
+                result = await run_level(client, payloads, args.mix, rows, concurrency, args.requests, args.seed)
+                results.append(asdict(result))
+                print(
+                    f"rows={rows} concurrency={concurrency}: {result.throughput_rps} req/s, "
+                    f"p50={result.latency_ms['p50']}ms p99={result.latency_ms['p99']}ms errors={result.errors}",
+                    file=sys.stderr,
+                )
+
+    return {
+        "target": args.url or "in-process",
+        "started_at": datetime.now(UTC).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "requests_per_level": args.requests,
+        "columns": columns,
+        "results": results,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the xserve /predict endpoints.")
+    parser.add_argument("--url", help="Base URL of a running server. Omit to run the app in-process.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 32, 512], help="Rows per request.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="Concurrent clients.")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per rows/concurrency level.")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests before each payload size.")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("rows"), help="Request mix, e.g. rows=0.8,arrow=0.2")
+    parser.add_argument("--columns", nargs="+", help="Feature columns; read from the loaded processor by default.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = json.dumps(asyncio.run(run_benchmark(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# Rough per-entry bookkeeping cost (OrderedDict node, tuple, key and timestamp objects).
+_ENTRY_OVERHEAD_BYTES = 160
+
+
+@dataclass
+class CacheLookup:
+    version: Any
+    keys: np.ndarray
+    values: list[Any]
+    missed: np.ndarray
+    # First occurrence of every key: the rows the processor keeps, as it drops duplicates.
+    first: np.ndarray
+    # First occurrence of every missed key: the only rows that need scoring.
+    unique: np.ndarray
+
+
+class PredictionCache:
+    """
+    LRU + TTL cache of per-row predictions.
+
+    Rows are keyed by a 64-bit hash of their values with the columns in sorted order, mixed
+    with a hash of the column names and dtypes. Entries belong to one artifact version; the
+    cache is cleared as soon as it sees a newer model/processor version.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: OrderedDict[int, tuple[float, Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Any = None
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def row_keys(data: pd.DataFrame) -> np.ndarray:
+        columns = sorted(data.columns)
+        canonical = data[columns]
+        schema = hash(tuple((column, str(dtype)) for column, dtype in zip(columns, canonical.dtypes, strict=True)))
+        row_hashes = pd.util.hash_pandas_object(canonical, index=False).to_numpy()
+        return row_hashes ^ np.uint64(schema & 0xFFFFFFFFFFFFFFFF)
+
+    def _sync_version(self, version: Any) -> None:
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+
+    def lookup(self, data: pd.DataFrame, version: Any) -> CacheLookup:
+        """Return the cached predictions for each row, None where the row missed."""
+        keys = self.row_keys(data)
+        now = time.monotonic()
+        values: list[Any] = []
+
+        with self._lock:
+            self._sync_version(version)
+            for key in keys.tolist():
+                entry = self._entries.get(key)
+                if entry is None or entry[0] < now:
+                    values.append(None)
+                    continue
+                self._entries.move_to_end(key)
+                values.append(entry[1])
+
+        missed = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+        first = ~pd.Series(keys).duplicated().to_numpy()
+        unique = missed & first
+        hits = len(values) - int(missed.sum())
+        self.hits += hits
+        self.misses += len(values) - hits
+        return CacheLookup(version=version, keys=keys, values=values, missed=missed, first=first, unique=unique)
+
+    def fill(self, lookup: CacheLookup, predictions: np.ndarray) -> np.ndarray | None:
+        """
+        Store the predictions for the unique missed rows and assemble the result in row order.
+        Like the processor, only the first occurrence of each row is kept. Returns None, and
+        caches nothing, when the predictions do not align with the unique missed rows.
+        """
+        predictions = np.asarray(predictions)
+        if not lookup.missed.any():
+            return np.asarray(lookup.values)[lookup.first]
+
+        unique_keys = lookup.keys[lookup.unique].tolist()
+        if len(predictions) != len(unique_keys):
+            return None
+
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if lookup.version == self._version:
+                for key, value in zip(unique_keys, predictions, strict=True):
+                    self._store(key, value, expires_at)
+
+        if lookup.unique.all():
+            return predictions
+
+        scored = dict(zip(unique_keys, predictions, strict=True))
+        values = lookup.values
+        return np.asarray(
+            [
+                scored[int(lookup.keys[index])] if values[index] is None else values[index]
+                for index in np.flatnonzero(lookup.first).tolist()
+            ]
+        )
+
+    def _store(self, key: int, value: Any, expires_at: float) -> None:
+        size = _ENTRY_OVERHEAD_BYTES + getattr(value, "nbytes", 8)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[2]
+
+        self._entries[key] = (expires_at, value, size)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int | float]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
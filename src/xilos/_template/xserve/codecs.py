@@ -0,0 +1,220 @@
+import io
+import json
+import zlib
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException, Response
+from pydantic import ValidationError
+from pydantic_core import from_json
+
+from .schemas.predict import ColumnarPredictRequest, PredictRequest
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_CONTENT_TYPE = "application/json"
+ARROW_STREAM_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def media_type(header: str | None) -> str:
+    """Strip parameters such as charset from a Content-Type/Accept header value."""
+    return (header or JSON_CONTENT_TYPE).split(";", 1)[0].strip().lower()
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Decoded request body exceeds {max_bytes} bytes.")
+
+
+class _Identity:
+    def decompress(self, data: bytes, max_bytes: int | None = None) -> bytes:
+        if max_bytes is not None and len(data) > max_bytes:
+            raise _too_large(max_bytes)
+        return data
+
+
+class _Gzip:
+    def __init__(self) -> None:
+        self._codec = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+
+    def decompress(self, data: bytes, max_bytes: int | None = None) -> bytes:
+        if max_bytes is None:
+            return self._codec.decompress(data)
+
+        # Expand at most one byte past the limit; the rest of the input stays in unconsumed_tail.
+        out = bytearray()
+        while True:
+            out += self._codec.decompress(data, max_bytes + 1 - len(out))
+            if len(out) > max_bytes:
+                raise _too_large(max_bytes)
+            data = self._codec.unconsumed_tail
+            if not data:
+                return bytes(out)
+
+
+class _Zstd:
+    _WRITE_SIZE = 64 * 1024
+
+    def __init__(self, zstandard: Any) -> None:
+        self._parts: list[bytes] = []
+        self._size = 0
+        self._max_bytes: int | None = None
+        self._writer = zstandard.ZstdDecompressor().stream_writer(self, write_size=self._WRITE_SIZE)
+
+    def write(self, data: bytes) -> int:
+        """Output sink of the stream writer, called for every decompressed block."""
+        self._size += len(data)
+        if self._max_bytes is not None and self._size > self._max_bytes:
+            raise _too_large(self._max_bytes)
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def decompress(self, data: bytes, max_bytes: int | None = None) -> bytes:
+        self._parts, self._size, self._max_bytes = [], 0, max_bytes
+        self._writer.write(data)
+        return b"".join(self._parts)
+
+
+def decompressor(content_encoding: str | None) -> Any:
+    """
+    Return an incremental decompressor for the Content-Encoding (identity, gzip or zstd). Its
+    `decompress(data, max_bytes)` raises 413 as soon as the output of one call exceeds `max_bytes`,
+    without expanding the rest of the input.
+    """
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding == "identity":
+        return _Identity()
+    if encoding == "gzip":
+        return _Gzip()
+    if encoding == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise HTTPException(status_code=415, detail="zstd encoding requires the zstandard package.") from e
+        return _Zstd(zstandard)
+
+    raise HTTPException(status_code=415, detail=f"Unsupported Content-Encoding: {encoding}")
+
+
+def decompress(body: bytes, content_encoding: str | None, max_bytes: int | None = None) -> bytes:
+    """Undo the Content-Encoding of a request body, rejecting bodies that expand beyond `max_bytes`."""
+    codec = decompressor(content_encoding)
+    try:
+        return codec.decompress(body, max_bytes)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Invalid {content_encoding} body: {e}") from e
+
+
+def parse_arrow(body: bytes) -> Any:
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise HTTPException(status_code=415, detail="Arrow payloads require the pyarrow package.") from e
+
+    try:
+        return pa.ipc.open_stream(body).read_all()
+    except pa.ArrowInvalid as e:
+        raise HTTPException(status_code=422, detail=f"Invalid Arrow IPC stream: {e}") from e
+
+
+def parse_json(body: bytes) -> PredictRequest | ColumnarPredictRequest:
+    """Parse either the row-oriented `data` or the column-oriented `columns` body."""
+    try:
+        payload = from_json(body)
+        if isinstance(payload, dict) and "columns" in payload:
+            return ColumnarPredictRequest.model_validate(payload)
+        return PredictRequest.model_validate(payload)
+
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False)) from e
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+def parse_body(
+    body: bytes,
+    content_type: str | None,
+    content_encoding: str | None,
+    max_bytes: int | None = None,
+) -> Any:
+    """Decompress and parse a /predict request body, negotiating on Content-Type."""
+    body = decompress(body, content_encoding, max_bytes)
+    mtype = media_type(content_type)
+
+    if mtype == ARROW_STREAM_CONTENT_TYPE:
+        return parse_arrow(body)
+    if mtype == JSON_CONTENT_TYPE:
+        return parse_json(body)
+
+    raise HTTPException(status_code=415, detail=f"Unsupported Content-Type: {mtype}")
+
+
+def to_frame(payload: Any) -> pd.DataFrame:
+    """Build the DataFrame for a parsed body (rows, columns or an Arrow table)."""
+    try:
+        if isinstance(payload, ColumnarPredictRequest):
+            return pd.DataFrame(payload.columns)
+        if isinstance(payload, PredictRequest):
+            return pd.DataFrame(payload.data)
+        return payload.to_pandas()
+
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+def _numpy_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray | np.generic):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Serialize a response body. With orjson installed, NumPy arrays are written directly from
+    their buffers; object-dtype or non-contiguous arrays fall back to `tolist`.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_numpy_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_numpy_default).encode()
+
+
+def dumps_arrow(content: dict[str, Any]) -> bytes:
+    """Write the predictions as a one-column Arrow IPC stream; scalar fields go in the schema metadata."""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise HTTPException(status_code=406, detail="Arrow responses require the pyarrow package.") from e
+
+    metadata = {key: str(value) for key, value in content.items() if key != "predictions"}
+    table = pa.table({"predictions": np.asarray(content["predictions"])}).replace_schema_metadata(metadata)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def prediction_response(content: dict[str, Any], accept: str | None) -> Response:
+    """Encode a prediction body as Arrow IPC when the client accepts it, JSON otherwise."""
+    if ARROW_STREAM_CONTENT_TYPE in (accept or "").lower():
+        return Response(dumps_arrow(content), media_type=ARROW_STREAM_CONTENT_TYPE)
+    return Response(dumps_json(content), media_type=JSON_CONTENT_TYPE)
+
+
+PREDICT_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            JSON_CONTENT_TYPE: {
+                "schema": {
+                    "anyOf": [PredictRequest.model_json_schema(), ColumnarPredictRequest.model_json_schema()],
+                },
+            },
+            ARROW_STREAM_CONTENT_TYPE: {"schema": {"type": "string", "format": "binary"}},
+        },
+    },
+}
@@ -0,0 +1,126 @@
+import copy
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from ..xtrain.processor.processor import ExampleProcessor
+
+
+class CompiledPredictor:
+    """
+    Fused inference path for an ExampleProcessor pipeline and its model.
+
+    The fitted imputer and scaler are collapsed into per-column arrays so that a request
+    is scored as `where(isnan(x), fill, x * scale + offset)` on one contiguous float32
+    buffer, followed directly by the estimator's `predict`. Rows are cleaned with the
+    processor's `clean_data` first, so the same rows are scored as by `processor.transform`.
+    Only processors that keep ExampleProcessor's `feature_engineer` can be compiled: the
+    pipeline's input columns are then read straight from the cleaned request.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        processor: Any,
+        columns: list[str],
+        scale: np.ndarray,
+        offset: np.ndarray,
+        fill: np.ndarray,
+        estimator: Any,
+    ) -> None:
+        self.model = model
+        self.processor = processor
+        self.columns = columns
+        self.scale = scale
+        self.offset = offset
+        self.fill = fill
+        self.estimator = estimator
+
+    @classmethod
+    def compile(cls, model: Any, processor: Any) -> "CompiledPredictor":
+        """Fold the fitted pipeline steps into affine arrays. Raises ValueError for unsupported steps."""
+        if getattr(type(processor), "feature_engineer", None) is not ExampleProcessor.feature_engineer:
+            raise ValueError(f"{type(processor).__name__} derives its own features, which cannot be compiled")
+
+        pipeline = getattr(processor, "pipeline", None)
+        if not isinstance(pipeline, Pipeline) or not hasattr(pipeline, "feature_names_in_"):
+            raise ValueError("processor has no fitted sklearn pipeline with feature names")
+
+        columns = np.asarray(pipeline.feature_names_in_, dtype=object)
+        scale = np.ones(len(columns))
+        offset = np.zeros(len(columns))
+        fill = np.full(len(columns), np.nan)
+
+        for name, step in pipeline.steps:
+            if isinstance(step, SimpleImputer):
+                if step.add_indicator or not (isinstance(step.missing_values, float) and np.isnan(step.missing_values)):
+                    raise ValueError(f"step {name!r}: only NaN imputation without indicators can be compiled")
+                statistics = step.statistics_
+                if not getattr(step, "keep_empty_features", False):
+                    # Columns that were all missing at fit time are dropped by the imputer.
+                    kept = ~np.isnan(statistics)
+                    columns, scale, offset, fill, statistics = (
+                        columns[kept],
+                        scale[kept],
+                        offset[kept],
+                        fill[kept],
+                        statistics[kept],
+                    )
+                fill = np.where(np.isnan(fill), statistics, fill)
+
+            elif isinstance(step, StandardScaler):
+                mean = step.mean_ if step.with_mean else 0.0
+                std = step.scale_ if step.with_std else 1.0
+                scale, offset, fill = scale / std, (offset - mean) / std, (fill - mean) / std
+
+            elif step is not None and step != "passthrough":
+                raise ValueError(f"step {name!r}: {type(step).__name__} cannot be compiled")
+
+        estimator = model.model
+        fitted_names = getattr(estimator, "feature_names_in_", None)
+        if fitted_names is not None:
+            if list(fitted_names) != list(columns):
+                raise ValueError("model was fitted on different columns than the processor produces")
+            # Column order is checked here once, so predict can take a bare array without warnings.
+            estimator = copy.copy(estimator)
+            if "feature_names_in_" in vars(estimator):
+                del estimator.feature_names_in_
+
+        return cls(
+            model=model,
+            processor=processor,
+            columns=list(columns),
+            scale=scale.astype(np.float32),
+            offset=offset.astype(np.float32),
+            fill=fill.astype(np.float32),
+            estimator=estimator,
+        )
+
+    def clean(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Drop the rows the processor drops (e.g. duplicates) before they are scored."""
+        return self.processor.clean_data(data)
+
+    def to_array(self, data: pd.DataFrame) -> np.ndarray:
+        """Copy the feature columns into a C-contiguous float32 buffer and apply the fused transform."""
+        X = np.empty((len(data), len(self.columns)), dtype=np.float32)
+        try:
+            for j, column in enumerate(self.columns):
+                X[:, j] = data[column].to_numpy(dtype=np.float32, na_value=np.nan)
+        except KeyError as e:
+            raise ValueError(f"Missing feature column {e}") from e
+
+        missing = np.isnan(X)
+        np.multiply(X, self.scale, out=X)
+        np.add(X, self.offset, out=X)
+        np.copyto(X, np.broadcast_to(self.fill, X.shape), where=missing)
+        return X
+
+    def predict_array(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(self.estimator.predict(X))
+
+    def predict(self, data: pd.DataFrame) -> np.ndarray:
+        return self.predict_array(self.to_array(self.clean(data)))
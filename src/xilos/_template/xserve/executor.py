@@ -0,0 +1,49 @@
+import asyncio
+import functools
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from loguru import logger
+from starlette.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+
+
+class InferenceExecutor:
+    """
+    Runs blocking inference work off the event loop.
+
+    With `max_workers` set, calls run on a dedicated, bounded thread pool so CPU-bound
+    scoring cannot starve Starlette's shared threadpool. Without it, calls fall back to
+    the default threadpool, which matches the behaviour of plain `def` routes.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+
+    def start(self) -> None:
+        if self.max_workers is None or self._pool is not None:
+            return
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="xserve-inference")
+
+        # Threads are spawned lazily; make every worker exist before the first request.
+        barrier = threading.Barrier(self.max_workers)
+        for future in [self._pool.submit(barrier.wait) for _ in range(self.max_workers)]:
+            future.result()
+        logger.info(f"Inference executor started with {self.max_workers} workers.")
+
+    def stop(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if self._pool is None:
+            return await run_in_threadpool(fn, *args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(fn, *args, **kwargs))
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from ..xcore.xmodel import XModel
+from ..xcore.xprocessor import DataProcessor
+from .compiled import CompiledPredictor
+from .metrics import BATCH_ROWS, STAGE_SECONDS
+
+
+def scored_index(data: pd.DataFrame, processed, predictions: np.ndarray) -> pd.Index | None:
+    """Labels of the input rows the predictions belong to, or None when the processor did not keep them."""
+    index = getattr(processed, "index", None)
+    if isinstance(index, pd.Index) and len(index) == len(predictions):
+        return index
+    return data.index if len(predictions) == len(data) else None
+
+
+def run_inference(data: pd.DataFrame, model: XModel, processor: DataProcessor, with_index: bool = False):
+    """
+    Transform the raw frame and score it with the model. With `with_index`, also return the
+    labels of the rows that were scored (see `scored_index`).
+    """
+    BATCH_ROWS.observe(len(data))
+    with STAGE_SECONDS.time(stage="transform"):
+        X_processed = processor.transform(data)
+    with STAGE_SECONDS.time(stage="predict"):
+        predictions = np.asarray(model.predict(X_processed))
+    return (predictions, scored_index(data, X_processed, predictions)) if with_index else predictions
+
+
+def run_compiled(data: pd.DataFrame, predictor: CompiledPredictor, with_index: bool = False):
+    """Score the raw frame through the fused float32 path of a compiled predictor."""
+    BATCH_ROWS.observe(len(data))
+    with STAGE_SECONDS.time(stage="transform"):
+        data = predictor.clean(data)
+        X = predictor.to_array(data)
+    with STAGE_SECONDS.time(stage="predict"):
+        predictions = predictor.predict_array(X)
+    return (predictions, data.index) if with_index else predictions
@@ -0,0 +1,270 @@
+import itertools
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import polars as pl
+from loguru import logger
+
+from ..config import ProjectConfig
+from ..xcore.xstore import DataTable
+
+LOG_COLUMNS = ["request_id", "timestamp", "model", "status", "rows", "input", "output", "error"]
+
+
+def _to_json(value: Any, max_rows: int) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, pd.DataFrame):
+        return value.head(max_rows).to_json(orient="records")
+    if isinstance(value, np.ndarray):
+        value = value[:max_rows].tolist()
+    elif isinstance(value, list):
+        value = value[:max_rows]
+    return json.dumps(value, default=str)
+
+
+def _head(value: Any, max_rows: int) -> Any:
+    # Copied, so the sample does not keep the request's buffers alive.
+    if isinstance(value, pd.DataFrame):
+        return value.head(max_rows).copy()
+    if isinstance(value, np.ndarray):
+        return value[:max_rows].copy()
+    if isinstance(value, list):
+        return value[:max_rows]
+    return value
+
+
+def _nbytes(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=False, deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
+def to_log_record(payload: dict[str, Any], max_rows: int) -> dict[str, str | None]:
+    """
+    Serialize a log payload into strings, keeping the first `max_rows` input rows and predictions;
+    `rows` holds the full row count of the request.
+    """
+    data = payload["input"]
+    rows = payload.get("rows", None if data is None else len(data))
+    return {
+        "request_id": payload["request_id"],
+        "timestamp": payload["timestamp"],
+        "model": payload.get("model"),
+        "status": payload["status"],
+        "rows": None if rows is None else str(rows),
+        "input": _to_json(data, max_rows),
+        "output": _to_json(payload["output"], max_rows),
+        "error": payload["error"],
+    }
+
+
+def to_log_frame(records: list[dict[str, str | None]]) -> pl.DataFrame:
+    """Collect serialized log records into a frame with a stable, all-string schema."""
+    return pl.DataFrame(
+        {column: [record[column] for record in records] for column in LOG_COLUMNS},
+        schema={column: pl.String for column in LOG_COLUMNS},
+    )
+
+
+class ParquetLogWriter:
+    """Writes each flushed batch to a new Parquet file in a local directory."""
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._sequence = itertools.count()
+
+    def __call__(self, frame: pl.DataFrame) -> None:
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        frame.write_parquet(self.directory / f"predictions_{stamp}_{next(self._sequence):06d}.parquet")
+
+
+class PredictionLogSink:
+    """
+    Buffers prediction log payloads in a bounded queue and flushes them in batches from a
+    background thread, so logging never blocks a request.
+
+    A submitted payload is cut to copies of its first `max_rows` input rows and predictions,
+    so the queue never holds request frames, and is serialized on the sink thread. The queue
+    is bounded both by `max_queue` payloads and by `max_bytes`, estimated from the in-memory
+    size of the queued samples. A batch is written when it reaches
+    `batch_size` records or `flush_seconds` after its first record. When the queue is full new
+    payloads are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[pl.DataFrame], None],
+        max_queue: int,
+        batch_size: int,
+        flush_seconds: float,
+        sample_rate: float = 1.0,
+        max_bytes: int | None = None,
+        max_rows: int = 100,
+    ) -> None:
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.max_rows = max_rows
+
+        self._queue: queue.Queue[tuple[dict[str, Any], int]] = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._stop_event = threading.Event()
+        self._worker: threading.Thread | None = None
+
+        self.submitted = 0
+        self.sampled_out = 0
+        self.dropped = 0
+        self.written = 0
+        self.lost = 0
+
+    def submit(self, payload: dict[str, Any]) -> bool:
+        """Enqueue a sample of a payload without blocking. Returns False when it was sampled out or dropped."""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return False
+
+        data = payload["input"]
+        record = {
+            **payload,
+            "rows": None if data is None else len(data),
+            "input": _head(data, self.max_rows),
+            "output": _head(payload["output"], self.max_rows),
+        }
+        size = _nbytes(record["input"]) + _nbytes(record["output"])
+        with self._lock:
+            if self.max_bytes is not None and self._bytes + size > self.max_bytes:
+                self.dropped += 1
+                return False
+            self._bytes += size
+
+        try:
+            self._queue.put_nowait((record, size))
+        except queue.Full:
+            with self._lock:
+                self._bytes -= size
+            self.dropped += 1
+            return False
+
+        self.submitted += 1
+        return True
+
+    def start(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._run, name="xserve-log-sink", daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the worker and flush whatever is still queued."""
+        self._stop_event.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+        while not self._queue.empty():
+            self._flush(self._drain(self.batch_size))
+
+    def _take(self, item: tuple[dict[str, Any], int]) -> dict[str, Any]:
+        record, size = item
+        with self._lock:
+            self._bytes -= size
+        return record
+
+    def _drain(self, limit: int) -> list[dict[str, Any]]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._take(self._queue.get_nowait()))
+            except queue.Empty:
+                break
+        return batch
+
+    def _collect(self) -> list[dict[str, Any]]:
+        try:
+            first = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return []
+
+        batch = [self._take(first)]
+        deadline = time.monotonic() + self.flush_seconds
+        while len(batch) < self.batch_size and not self._stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._take(self._queue.get(timeout=min(remaining, 0.5))))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            batch = self._collect()
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch: list[dict[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            self.writer(to_log_frame([to_log_record(payload, self.max_rows) for payload in batch]))
+            self.written += len(batch)
+        except Exception as e:
+            self.lost += len(batch)
+            logger.error(f"Failed to write {len(batch)} prediction logs: {e}")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "queued_bytes": self._bytes,
+            "submitted": self.submitted,
+            "sampled_out": self.sampled_out,
+            "dropped": self.dropped,
+            "written": self.written,
+            "lost": self.lost,
+        }
+
+
+def build_log_sink(config: ProjectConfig, table: DataTable) -> PredictionLogSink | None:
+    """Create the sink selected by SERVE_LOG_SINK, or None when prediction logging is off."""
+    if config.SERVE_LOG_SINK == "none":
+        return None
+
+    if config.SERVE_LOG_SINK == "table":
+        destination = config.SERVE_LOG_DESTINATION
+
+        def writer(frame: pl.DataFrame) -> None:
+            table.append(frame, destination)
+
+    else:
+        writer = ParquetLogWriter(config.SERVE_LOG_DESTINATION)
+
+    return PredictionLogSink(
+        writer=writer,
+        max_queue=config.SERVE_LOG_QUEUE_SIZE,
+        batch_size=config.SERVE_LOG_BATCH_SIZE,
+        flush_seconds=config.SERVE_LOG_FLUSH_SECONDS,
+        sample_rate=config.SERVE_LOG_SAMPLE_RATE,
+        max_bytes=int(config.SERVE_LOG_QUEUE_MB * 1024**2),
+        max_rows=config.SERVE_LOG_MAX_ROWS,
+    )
@@ -1,35 +1,311 @@
+import asyncio
+import contextlib
 import gc
+import threading
+import time
 import uuid
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from typing import Any
 
 import pandas as pd
 import uvicorn
-from fastapi import Depends, FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from loguru import logger
 
-from xilos._template.registry import registry
+from xilos._template.registry import ModelNotFoundError, registry, table_provider
 
+from ..config import project_config
 from ..xtrain.model import MLModel
-from .schemas.predict import PredictRequest
+from .admission import AdmissionController, remaining, request_deadline
+from .batching import MicroBatcher
+from .cache import PredictionCache
+from .codecs import PREDICT_REQUEST_BODY, dumps_json, parse_body, prediction_response, to_frame
+from .compiled import CompiledPredictor
+from .executor import InferenceExecutor
+from .inference import run_compiled, run_inference
+from .logsink import build_log_sink
+from .metrics import (
+    BATCH_ROWS,
+    ERRORS,
+    PROMETHEUS_CONTENT_TYPE,
+    REQUEST_SECONDS,
+    REQUESTS,
+    ROWS,
+    STAGE_SECONDS,
+    metrics,
+)
+from .procpool import ProcessInferencePool
+from .shadow import ShadowEvaluator
+from .singleflight import SingleFlight, request_key
+from .streaming import NDJSON_CONTENT_TYPE, BodyStreamingResponse, stream_frames
+from .warmup import warmup_frame
 
+compiled: CompiledPredictor | None = None
 
-# Define a concrete class for loading models (since MLModel is abstract)
-class ServingModel(MLModel):
-    def _build_model(self, **kwargs):
-        raise NotImplementedError("ServingModel is for loading existing models only.")
+procpool = (
+    ProcessInferencePool(
+        workers=project_config.SERVE_PROCESS_WORKERS,
+        model_loader=registry.model_artifact.loader,
+        processor_loader=registry.processor_artifact.loader,
+        model_path=registry.model_artifact.path,
+        processor_path=registry.processor_artifact.path,
+    )
+    if project_config.SERVE_PROCESS_WORKERS > 0
+    else None
+)
+
+
+def _infer(data: pd.DataFrame, model: MLModel, processor: Any, with_index: bool = False):
+    """
+    Score the resident artifacts on the process pool when it runs, otherwise in this process,
+    with the compiled predictor when it was built from these exact artifacts.
+    """
+    if procpool is not None and procpool.running and model is registry.model_artifact.value:
+        BATCH_ROWS.observe(len(data))
+        with STAGE_SECONDS.time(stage="process_pool"):
+            return procpool.infer(data, with_index=with_index)
+
+    predictor = compiled
+    if predictor is not None and predictor.model is model and predictor.processor is processor:
+        try:
+            return run_compiled(data, predictor, with_index=with_index)
+        except ValueError as e:
+            logger.warning(f"Compiled inference failed, using the processor pipeline: {e}")
+    return run_inference(data, model, processor, with_index=with_index)
+
+
+def _resident_inference(data: pd.DataFrame):
+    return _infer(data, registry.model_artifact.value, registry.processor_artifact.value, with_index=True)
+
+
+batcher = (
+    MicroBatcher(
+        infer=_resident_inference,
+        max_rows=project_config.SERVE_BATCH_MAX_ROWS,
+        max_wait_ms=project_config.SERVE_BATCH_MAX_WAIT_MS,
+        # One batch in flight per inference process, or per executor thread when scoring in-process.
+        workers=project_config.SERVE_PROCESS_WORKERS or project_config.SERVE_INFERENCE_WORKERS,
+    )
+    if project_config.SERVE_BATCHING
+    else None
+)
+
+executor = InferenceExecutor(max_workers=project_config.SERVE_INFERENCE_WORKERS if project_config.SERVE_ASYNC else None)
+
+cache = (
+    PredictionCache(
+        max_bytes=int(project_config.SERVE_CACHE_MAX_MB * 1024**2),
+        ttl_seconds=project_config.SERVE_CACHE_TTL_SECONDS,
+    )
+    if project_config.SERVE_CACHE
+    else None
+)
+
+log_sink = build_log_sink(project_config, table_provider)
+
+shadow = (
+    ShadowEvaluator(
+        model_artifact=registry.shadow_model_artifact,
+        processor_artifact=registry.shadow_processor_artifact,
+        sample_rate=project_config.SHADOW_SAMPLE_RATE,
+        max_queue=project_config.SHADOW_QUEUE_SIZE,
+    )
+    if registry.shadow_model_artifact is not None
+    else None
+)
+
+singleflight = (
+    SingleFlight(max_keys=project_config.SERVE_SINGLEFLIGHT_MAX_KEYS) if project_config.SERVE_SINGLEFLIGHT else None
+)
+
+admission = (
+    AdmissionController(
+        max_concurrency=project_config.SERVE_MAX_CONCURRENCY,
+        max_queue=project_config.SERVE_MAX_QUEUE,
+        queue_timeout_s=project_config.SERVE_QUEUE_TIMEOUT_SECONDS,
+        retry_after_s=project_config.SERVE_RETRY_AFTER_SECONDS,
+    )
+    if project_config.SERVE_ADMISSION
+    else None
+)
+
+
+def _collect_component_metrics() -> list[tuple[str, str, str, float]]:
+    samples = []
+    if cache is not None:
+        stats = cache.stats()
+        samples += [
+            ("xserve_cache_hits_total", "counter", "Prediction cache row hits.", stats["hits"]),
+            ("xserve_cache_misses_total", "counter", "Prediction cache row misses.", stats["misses"]),
+            ("xserve_cache_evictions_total", "counter", "Prediction cache evictions.", stats["evictions"]),
+            ("xserve_cache_bytes", "gauge", "Estimated prediction cache size.", stats["bytes"]),
+        ]
+    if log_sink is not None:
+        stats = log_sink.stats()
+        samples += [
+            ("xserve_prediction_logs_written_total", "counter", "Prediction logs written.", stats["written"]),
+            ("xserve_prediction_logs_dropped_total", "counter", "Prediction logs dropped.", stats["dropped"]),
+            ("xserve_prediction_logs_lost_total", "counter", "Prediction logs lost on write.", stats["lost"]),
+            ("xserve_prediction_logs_queued", "gauge", "Prediction logs waiting to be flushed.", stats["queued"]),
+            (
+                "xserve_prediction_logs_queued_bytes",
+                "gauge",
+                "Queued prediction log bytes.",
+                stats["queued_bytes"],
+            ),
+        ]
+    if shadow is not None:
+        stats = shadow.stats()
+        samples += [
+            ("xserve_shadow_dropped_total", "counter", "Shadow samples dropped on a full queue.", stats["dropped"]),
+            ("xserve_shadow_failures_total", "counter", "Shadow samples that failed to score.", stats["failed"]),
+        ]
+    if singleflight is not None:
+        stats = singleflight.stats()
+        samples += [
+            ("xserve_singleflight_shared_total", "counter", "Requests joined to an in-flight twin.", stats["shared"]),
+        ]
+    if admission is not None:
+        stats = admission.stats()
+        samples += [
+            ("xserve_requests_in_flight", "gauge", "Requests holding an inference slot.", stats["in_flight"]),
+            ("xserve_requests_queued", "gauge", "Requests waiting for an inference slot.", stats["waiting"]),
+        ]
+    stats = registry.repository.stats()
+    samples += [
+        ("xserve_model_loads_total", "counter", "Named model loads.", stats["loads"]),
+        ("xserve_model_evictions_total", "counter", "Named model evictions.", stats["evictions"]),
+        ("xserve_model_resident_bytes", "gauge", "Artifact size of resident named models.", stats["resident_bytes"]),
+    ]
+    return samples
+
+
+metrics.register_collector(_collect_component_metrics)
+
+
+max_body_bytes = int(project_config.SERVE_MAX_BODY_MB * 1024**2)
+
+
+def _decode(body: bytes, content_type: str | None, content_encoding: str | None) -> pd.DataFrame:
+    with STAGE_SECONDS.time(stage="parse"):
+        payload = parse_body(body, content_type, content_encoding, max_body_bytes)
+    with STAGE_SECONDS.time(stage="frame"):
+        return to_frame(payload)
+
+
+def _artifact_version(model: MLModel, processor: Any) -> tuple[int, int] | None:
+    """Version of the resident artifacts, or None when the request holds superseded ones."""
+    resident_model, model_version = registry.model_artifact.snapshot()
+    resident_processor, processor_version = registry.processor_artifact.snapshot()
+    if resident_model is not model or resident_processor is not processor:
+        return None
+    return model_version, processor_version
+
+
+async def _score(request_id: str, df: pd.DataFrame, model: MLModel, processor: Any):
+    if batcher is not None:
+        return await asyncio.wrap_future(batcher.submit(request_id, df))
+    return await executor.run(_infer, df, model, processor)
+
+
+def _compile() -> None:
+    """Rebuild the fused predictor for the resident artifacts, falling back to the pipeline on failure."""
+    global compiled
+    model, processor = registry.model_artifact.value, registry.processor_artifact.value
+    if model is None or processor is None:
+        return
+
+    try:
+        compiled = CompiledPredictor.compile(model, processor)
+        logger.info(f"Compiled inference path built for {len(compiled.columns)} features")
+    except (ValueError, AttributeError, TypeError) as e:
+        compiled = None
+        logger.warning(f"Compiled inference disabled, using the processor pipeline: {e}")
+
+
+if project_config.SERVE_COMPILED:
+    registry.add_reload_listener(_compile)
+if procpool is not None:
+    registry.add_reload_listener(procpool.reload)
+
+
+async def _score_request(request_id: str, df: pd.DataFrame, model: MLModel, processor: Any, model_ref: str | None):
+    """Score a decoded request: named models on the executor, the default model via the cache and batcher."""
+    if model_ref is not None:
+        return await executor.run(run_inference, df, model, processor)
+
+    version = _artifact_version(model, processor) if cache is not None else None
+    if version is None:
+        return await _score(request_id, df, model, processor)
+
+    lookup = await executor.run(cache.lookup, df, version)
+    missed = df[lookup.unique] if lookup.unique.any() else None
+    fresh = await _score(request_id, missed, model, processor) if missed is not None else []
+    predictions = await executor.run(cache.fill, lookup, fresh)
+    if predictions is None:
+        # The processor dropped some of the unique rows: the result cannot be assembled per row.
+        return fresh if lookup.unique.all() else await _score(request_id, df, model, processor)
+    return predictions
+
+
+warmed = threading.Event()
+
+
+def _warmup() -> None:
+    """Score a synthetic batch with the resident artifacts to trigger lazy initialisation."""
+    model, processor = registry.model_artifact.value, registry.processor_artifact.value
+    if model is None or processor is None:
+        return
+
+    if project_config.SERVE_WARMUP_ROWS > 0:
+        frame = warmup_frame(processor, project_config.SERVE_WARMUP_ROWS, project_config.SERVE_WARMUP_PATH)
+        if frame is not None:
+            for _ in range(project_config.SERVE_WARMUP_ITERATIONS):
+                _infer(frame, model, processor)
+            logger.info(f"Warmup: scored {project_config.SERVE_WARMUP_ITERATIONS} batches of {len(frame)} rows")
+
+    warmed.set()
+
+
+registry.add_reload_listener(_warmup)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager."""
     logger.info("Lifespan: Loading resources...")
+    executor.start()
+    # Preload and warm up before accepting traffic; the watcher then only handles changes.
+    await asyncio.to_thread(registry.refresh)
+    if not warmed.is_set():
+        await asyncio.to_thread(_warmup)  # The artifacts were already resident, so no reload listener ran
+    if procpool is not None:
+        await asyncio.to_thread(procpool.start)
+    registry.start()
+    if batcher is not None:
+        batcher.start()
+    if log_sink is not None:
+        log_sink.start()
+    if shadow is not None:
+        shadow.start()
 
     yield
 
     logger.info("Lifespan: Cleaning up resources...")
+    if shadow is not None:
+        shadow.stop()
+    if batcher is not None:
+        batcher.stop()
+    if log_sink is not None:
+        log_sink.stop()
+    executor.stop()
+    if procpool is not None:
+        procpool.stop()
+    registry.repository.shutdown()
+    registry.stop()
     gc.collect()
     logger.info("Resources cleared.")
 
@@ -38,7 +314,7 @@ app = FastAPI(title="xServe API", lifespan=lifespan)
 
 
 @app.get("/health")
-def health_check(
+async def health_check(
     request: Request,
     model: MLModel = Depends(registry.get_model),  # noqa: B008
     processor: Any = Depends(registry.get_processor),  # noqa: B008
@@ -46,56 +322,232 @@ def health_check(
     is_model = model is not None
     is_processor = processor is not None
     status = "ok" if all([is_model, is_processor]) else "error"
-    return {"status": status, "model_loaded": is_model, "processor_loaded": is_processor}
+    response = {"status": status, "model_loaded": is_model, "processor_loaded": is_processor}
+    if cache is not None:
+        response["cache"] = cache.stats()
+    if log_sink is not None:
+        response["prediction_log"] = log_sink.stats()
+    if admission is not None:
+        response["admission"] = admission.stats()
+    if shadow is not None:
+        response["shadow"] = shadow.stats()
+    if singleflight is not None:
+        response["singleflight"] = singleflight.stats()
+    return response
 
 
-@app.post("/predict")
-def predict(
-    request: PredictRequest,
-    model: MLModel = Depends(registry.get_model),  # noqa: B008
-    processor: Any = Depends(registry.get_processor),  # noqa: B008
+@app.get("/live")
+async def liveness():
+    return {"status": "alive"}
+
+
+@app.get("/ready")
+async def readiness():
+    """Ready once the model and processor are resident and have been warmed up. Reads state only."""
+    is_model = registry.model_artifact.value is not None
+    is_processor = registry.processor_artifact.value is not None
+    is_warm = warmed.is_set()
+    content = {"model_loaded": is_model, "processor_loaded": is_processor, "warmed_up": is_warm}
+    if is_model and is_processor and is_warm:
+        return {"status": "ready", **content}
+    return JSONResponse(status_code=503, content={"status": "not_ready", **content})
+
+
+async def _predict(request: Request, model: MLModel, processor: Any, model_ref: str | None = None):
+    """
+    Shared /predict flow. The default model goes through the prediction cache and the
+    micro-batcher; named models (`model_ref`) are scored directly on the executor.
+
+    With admission control enabled, requests beyond the concurrency limit wait in a bounded
+    queue or are shed with 429/503. Scoring is cancelled once the request deadline passes.
+    """
+    deadline = request_deadline(request, project_config.SERVE_REQUEST_TIMEOUT_MS)
+    gate = admission.admit(deadline) if admission is not None else contextlib.nullcontext()
+    async with gate:
+        return await _predict_admitted(request, model, processor, model_ref, deadline)
+
+
+async def _predict_admitted(
+    request: Request,
+    model: MLModel,
+    processor: Any,
+    model_ref: str | None,
+    deadline: float | None,
 ):
     request_id = str(uuid.uuid4())
     start_time = datetime.now(UTC)
+    started = time.perf_counter()
+    model_label = model_ref or "default"
+
+    body = await request.body()
+    df = await executor.run(
+        _decode,
+        body,
+        request.headers.get("content-type"),
+        request.headers.get("content-encoding"),
+    )
 
     log_payload = {
         "request_id": request_id,
         "timestamp": start_time.isoformat(),
-        "input": request.dict(),
+        "model": model_label,
+        "input": df,
         "status": "pending",
         "output": None,
         "error": None,
     }
 
+    ROWS.inc(len(df), model=model_label)
+
     try:
-        # Inference logic
-        df = pd.DataFrame(request.data)
-        X_processed = processor.transform(df)
-        predictions = model.predict(X_processed)
-        result_list = predictions.tolist()
+        if await request.is_disconnected():
+            log_payload["status"] = "cancelled"
+            return JSONResponse(status_code=499, content={"request_id": request_id, "error": "Client disconnected."})
+
+        scoring_started = time.perf_counter()
+        # Inference logic; leaving the timeout cancels work still queued in the batcher or executor.
+        async with asyncio.timeout(remaining(deadline)):
+            if singleflight is None:
+                predictions = await _score_request(request_id, df, model, processor, model_ref)
+            else:
+                # Identical bodies for the same artifacts that are already being scored share one result.
+                key = request_key(
+                    request.url.path,
+                    request.headers.get("content-type"),
+                    request.headers.get("content-encoding"),
+                    id(model),
+                    id(processor),
+                    body,
+                )
+                predictions, _ = await singleflight.do(
+                    key, lambda: _score_request(request_id, df, model, processor, model_ref)
+                )
+        scoring_finished = time.perf_counter()
+
+        with STAGE_SECONDS.time(stage="serialize"):
+            content = {"request_id": request_id, "predictions": predictions}
+            if model_ref is not None:
+                content["model"] = model_ref
+            response = prediction_response(content, request.headers.get("accept"))
 
-        # Update log
+        # Update log; the sink keeps a bounded sample of the rows and predictions and serializes it off the loop.
         log_payload["status"] = "success"
-        log_payload["output"] = result_list
+        log_payload["output"] = predictions
 
-        return {"request_id": request_id, "predictions": result_list}
+        if shadow is not None and model_ref is None:
+            shadow.submit(df, processor, predictions, scoring_finished - scoring_started)
+
+        return response
+
+    except TimeoutError:
+        logger.warning(f"Prediction {request_id} exceeded its deadline")
+        log_payload["status"] = "timeout"
+        log_payload["error"] = "Request deadline exceeded."
+        return JSONResponse(status_code=504, content={"request_id": request_id, "error": "Request deadline exceeded."})
 
     except Exception as e:
         logger.error(f"Prediction failed: {e}")
+        ERRORS.inc(error=type(e).__name__)
         log_payload["status"] = "failed"
         log_payload["error"] = str(e)
 
         return JSONResponse(status_code=500, content={"request_id": request_id, "error": str(e)})
 
+    finally:
+        REQUESTS.inc(model=model_label, status=log_payload["status"])
+        REQUEST_SECONDS.observe(time.perf_counter() - started, model=model_label)
+        if log_sink is not None:
+            log_sink.submit(log_payload)
+
+
+@app.post("/predict", openapi_extra=PREDICT_REQUEST_BODY)
+async def predict(
+    request: Request,
+    model: MLModel = Depends(registry.get_model),  # noqa: B008
+    processor: Any = Depends(registry.get_processor),  # noqa: B008
+):
+    """Score rows sent as row-oriented JSON, column-oriented JSON or an Arrow IPC stream."""
+    return await _predict(request, model, processor)
 
-def main():
-    from ..settings import project_config
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.get("/models")
+async def list_models():
+    return registry.repository.stats()
+
+
+@app.post("/predict/{model_name}/{version}", openapi_extra=PREDICT_REQUEST_BODY)
+async def predict_named(
+    request: Request,
+    model_name: str,
+    version: str,
+    processor: Any = Depends(registry.get_processor),  # noqa: B008
+):
+    """
+    Score with a named model version from MODEL_REPOSITORY_DIR. `version` may be `latest`
+    or an alias; versions without their own processor use the default one.
+    """
+    try:
+        entry = await asyncio.wrap_future(registry.repository.acquire(model_name, version))
+    except ModelNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+    return await _predict(request, entry.model, entry.processor or processor, f"{entry.name}/{entry.version}")
+
+
+@app.post("/predict/stream")
+async def predict_stream(
+    request: Request,
+    model: MLModel = Depends(registry.get_model),  # noqa: B008
+    processor: Any = Depends(registry.get_processor),  # noqa: B008
+):
+    """
+    Score an NDJSON or Arrow IPC stream in chunks of SERVE_STREAM_CHUNK_ROWS rows.
+
+    Each scored chunk is written back as one NDJSON line holding its row offset and predictions.
+    Errors in the first chunk get an error status; later ones are reported in-band.
+    """
+    request_id = str(uuid.uuid4())
+    frames = stream_frames(
+        request,
+        project_config.SERVE_STREAM_CHUNK_ROWS,
+        executor,
+        project_config.SERVE_STREAM_MAX_LINE_BYTES,
+        max_body_bytes,
+    )
+    # Read the first chunk before the status line is sent, so a body rejected on its first
+    # chunk (e.g. a line over the size limit) gets a proper error status.
+    first = await anext(frames, None)
+
+    async def _score() -> AsyncIterator[bytes]:
+        offset = 0
+        try:
+            df = first
+            while df is not None:
+                predictions = await executor.run(_infer, df, model, processor)
+                yield dumps_json({"request_id": request_id, "offset": offset, "predictions": predictions}) + b"\n"
+                offset += len(df)
+                df = await anext(frames, None)
+
+        except Exception as e:
+            # Status and headers are already sent, so the failure is reported in-band.
+            logger.error(f"Streaming prediction failed at row {offset}: {e}")
+            yield dumps_json({"request_id": request_id, "offset": offset, "error": str(e)}) + b"\n"
+
+    return BodyStreamingResponse(_score(), media_type=NDJSON_CONTENT_TYPE)
+
+
+def main():
     uvicorn.run(
         "xilos.xserve.main:app",
         host=project_config.SERVE_HOST,
         port=project_config.SERVE_PORT,
-        reload=True,
+        workers=project_config.SERVE_WORKERS,
+        reload=project_config.SERVE_WORKERS == 1,
     )
 
 
@@ -0,0 +1,252 @@
+import multiprocessing as mp
+import queue
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .inference import scored_index
+
+# Column buffers start on cache-line boundaries inside the shared block.
+_ALIGN = 64
+_MIN_BLOCK_BYTES = 1024**2
+
+
+def _aligned(nbytes: int) -> int:
+    return -(-nbytes // _ALIGN) * _ALIGN
+
+
+def _shared_column(values: np.ndarray) -> bool:
+    return values.dtype.kind in "biuf"
+
+
+def _attach(name: str, attached: dict[str, SharedMemory]) -> SharedMemory:
+    """Attach to a block created by the API process, dropping the previous one after a resize."""
+    shm = attached.get(name)
+    if shm is None:
+        for old in attached.values():
+            old.close()
+        attached.clear()
+        shm = attached[name] = SharedMemory(name=name)
+    return shm
+
+
+def _read_frame(buffer: memoryview, rows: int, order: list, layout: list, inline: dict[Any, Any]) -> pd.DataFrame:
+    """Rebuild the request frame; column data is copied out of the shared block."""
+    columns = {name: np.ndarray((rows,), dtype=dtype, buffer=buffer, offset=offset) for name, dtype, offset in layout}
+    columns.update(inline)
+    return pd.DataFrame({name: columns[name] for name in order}, copy=True)
+
+
+def _worker_main(
+    conn: Connection,
+    model_loader: Callable[[str], Any],
+    processor_loader: Callable[[str], Any],
+    model_path: str,
+    processor_path: str,
+) -> None:
+    """Worker loop: hold the model and processor, score frames passed through shared memory."""
+    inputs: dict[str, SharedMemory] = {}
+    outputs: dict[str, SharedMemory] = {}
+    model = processor = None
+
+    while (message := conn.recv()) is not None:
+        try:
+            if message[0] == "load":
+                model, processor = model_loader(model_path), processor_loader(processor_path)
+                conn.send(("ok", None, None, None))
+                continue
+
+            _, input_name, rows, order, layout, inline, output_name = message
+            frame = _read_frame(_attach(input_name, inputs).buf, rows, order, layout, inline)
+            X = processor.transform(frame)
+            predictions = np.asarray(model.predict(X))
+            # The frame has a RangeIndex, so the labels of the scored rows are their positions.
+            index = scored_index(frame, X, predictions)
+            positions = None if index is None else frame.index.get_indexer(index)
+            del frame, X
+
+            output = _attach(output_name, outputs)
+            if predictions.dtype.kind in "biuf" and predictions.nbytes <= output.size:
+                np.ndarray(predictions.shape, dtype=predictions.dtype, buffer=output.buf)[...] = predictions
+                conn.send(("ok", predictions.dtype.str, predictions.shape, positions))
+            else:
+                conn.send(("ok", None, predictions, positions))
+
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}", None, None))
+
+    for shm in [*inputs.values(), *outputs.values()]:
+        shm.close()
+
+
+class _Worker:
+    """API-side handle of one inference process and the shared blocks it reads from and writes to."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.process: Any = None
+        self.conn: Connection | None = None
+        self.input: SharedMemory | None = None
+        self.output: SharedMemory | None = None
+        self.generation = -1
+
+    def spawn(self, ctx: Any, args: tuple) -> None:
+        parent, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, *args), name=f"xserve-infer-{self.index}")
+        self.process.daemon = True
+        self.process.start()
+        child.close()
+        self.conn = parent
+        self.generation = -1
+
+    def request(self, message: tuple) -> tuple:
+        self.conn.send(message)
+        status, *reply = self.conn.recv()
+        if status == "error":
+            raise RuntimeError(f"Inference worker {self.index}: {reply[0]}")
+        return tuple(reply)
+
+    def block(self, attr: str, nbytes: int) -> SharedMemory:
+        """Return the worker's input or output block, replacing it with a larger one when needed."""
+        shm: SharedMemory | None = getattr(self, attr)
+        if shm is None or shm.size < nbytes:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+            size = max(nbytes, _MIN_BLOCK_BYTES, 2 * shm.size if shm is not None else 0)
+            shm = SharedMemory(create=True, size=size)
+            setattr(self, attr, shm)
+        return shm
+
+    def close(self) -> None:
+        if self.conn is not None:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.conn.close()
+            self.conn = None
+        if self.process is not None:
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.kill()
+            self.process = None
+        for attr in ("input", "output"):
+            shm = getattr(self, attr)
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+                setattr(self, attr, None)
+
+
+class ProcessInferencePool:
+    """
+    Scores batches in long-lived worker processes that each hold the model and processor.
+
+    Numeric columns are copied once into a per-worker shared memory block and read by the
+    worker without pickling; numeric predictions come back the same way. Other columns and
+    predictions travel through the worker's pipe. A caller thread holds one worker for the
+    duration of a call, so up to `workers` batches are scored in parallel, outside the GIL
+    of the API process. After `reload`, each worker loads the new artifacts before its next call.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        model_loader: Callable[[str], Any],
+        processor_loader: Callable[[str], Any],
+        model_path: str,
+        processor_path: str,
+    ) -> None:
+        self.workers = workers
+        self._args = (model_loader, processor_loader, model_path, processor_path)
+        self._ctx = mp.get_context("spawn")
+        self._handles: list[_Worker] = []
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._generation = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._handles)
+
+    def start(self) -> None:
+        """Spawn the workers and load the artifacts in each of them."""
+        if self.running:
+            return
+
+        self._handles = [_Worker(index) for index in range(self.workers)]
+        for worker in self._handles:
+            worker.spawn(self._ctx, self._args)
+        for worker in self._handles:
+            try:
+                self._load(worker)
+            except RuntimeError as e:
+                logger.error(f"{e}; it retries on its first call")
+            self._idle.put(worker)
+        logger.info(f"Process inference pool started with {self.workers} workers")
+
+    def stop(self) -> None:
+        for worker in self._handles:
+            worker.close()
+        self._handles = []
+        self._idle = queue.Queue()
+
+    def reload(self) -> None:
+        """Make every worker load the artifacts from disk again before its next call."""
+        self._generation += 1
+
+    def _load(self, worker: _Worker) -> None:
+        generation = self._generation
+        worker.request(("load",))
+        worker.generation = generation
+
+    def infer(self, data: pd.DataFrame, with_index: bool = False):
+        """
+        Score a frame on the next idle worker. Blocks while all workers are busy. With `with_index`,
+        also return the labels of the rows that were scored, as `run_inference` does.
+        """
+        worker = self._idle.get()
+        try:
+            if worker.generation != self._generation:
+                self._load(worker)
+            predictions, positions = self._score(worker, data)
+            if not with_index:
+                return predictions
+            if positions is None or (positions < 0).any():
+                return predictions, None
+            return predictions, data.index[positions]
+
+        except (EOFError, OSError) as e:
+            logger.error(f"Inference worker {worker.index} died ({e}); restarting it")
+            worker.close()
+            worker.spawn(self._ctx, self._args)
+            raise RuntimeError(f"Inference worker {worker.index} died while scoring") from e
+
+        finally:
+            self._idle.put(worker)
+
+    def _score(self, worker: _Worker, data: pd.DataFrame) -> tuple[np.ndarray, np.ndarray | None]:
+        rows = len(data)
+        columns = [(name, series.to_numpy()) for name, series in data.items()]
+        shared = [(name, values) for name, values in columns if _shared_column(values)]
+
+        block = worker.block("input", sum(_aligned(values.nbytes) for _, values in shared))
+        layout, offset = [], 0
+        for name, values in shared:
+            np.ndarray((rows,), dtype=values.dtype, buffer=block.buf, offset=offset)[...] = values
+            layout.append((name, values.dtype.str, offset))
+            offset += _aligned(values.nbytes)
+
+        inline = {name: values for name, values in columns if not _shared_column(values)}
+        output = worker.block("output", rows * 8)
+        dtype, result, positions = worker.request(
+            ("score", block.name, rows, list(data.columns), layout, inline, output.name)
+        )
+        if dtype is None:
+            return result, positions
+        return np.ndarray(result, dtype=dtype, buffer=output.buf).copy(), positions
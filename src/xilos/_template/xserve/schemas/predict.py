@@ -5,3 +5,7 @@ from pydantic import BaseModel
 
 class PredictRequest(BaseModel):
     data: list[dict[str, Any]]
+
+
+class ColumnarPredictRequest(BaseModel):
+    columns: dict[str, list[Any]]
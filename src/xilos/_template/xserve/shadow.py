@@ -0,0 +1,146 @@
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from ..registry import ResidentArtifact
+from .metrics import SHADOW_ROWS, SHADOW_SECONDS
+
+
+@dataclass
+class ShadowSample:
+    data: pd.DataFrame
+    processor: Any
+    primary: np.ndarray
+    primary_seconds: float
+
+
+def agreement(primary: np.ndarray, shadow: np.ndarray) -> np.ndarray:
+    """Per-row agreement: exact for labels, `isclose` for floating point scores."""
+    if np.issubdtype(primary.dtype, np.floating) or np.issubdtype(shadow.dtype, np.floating):
+        return np.isclose(primary.astype(float), shadow.astype(float), rtol=1e-3, atol=1e-6)
+    return primary == shadow
+
+
+class ShadowEvaluator:
+    """
+    Scores a sampled fraction of /predict traffic with a shadow model on a background thread.
+
+    The handler only enqueues the request frame and the primary's predictions; the shadow
+    transform/predict runs after the fact, so it adds no latency to the response. Agreement
+    with the primary and the latency of both models are recorded. Samples are dropped when
+    the queue is full.
+    """
+
+    def __init__(
+        self,
+        model_artifact: ResidentArtifact,
+        processor_artifact: ResidentArtifact | None,
+        sample_rate: float,
+        max_queue: int,
+    ) -> None:
+        self.model_artifact = model_artifact
+        self.processor_artifact = processor_artifact
+        self.sample_rate = sample_rate
+
+        self._queue: queue.Queue[ShadowSample] = queue.Queue(maxsize=max_queue)
+        self._stop_event = threading.Event()
+        self._worker: threading.Thread | None = None
+
+        self.sampled = 0
+        self.dropped = 0
+        self.scored = 0
+        self.failed = 0
+        self.rows = 0
+        self.agreed_rows = 0
+        self.abs_diff_sum = 0.0
+
+    def submit(self, data: pd.DataFrame, processor: Any, primary: np.ndarray, primary_seconds: float) -> bool:
+        """Enqueue a scored request without blocking. Returns False when it was not sampled or dropped."""
+        if random.random() >= self.sample_rate or self.model_artifact.value is None:
+            return False
+
+        try:
+            self._queue.put_nowait(ShadowSample(data, processor, primary, primary_seconds))
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        self.sampled += 1
+        return True
+
+    def start(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._run, name="xserve-shadow", daemon=True)
+        self._worker.start()
+        logger.info(f"Shadow evaluation enabled for {self.sample_rate:.0%} of requests")
+
+    def stop(self) -> None:
+        """Stop the worker; samples still queued are discarded."""
+        self._stop_event.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                sample = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._evaluate(sample)
+
+    def _evaluate(self, sample: ShadowSample) -> None:
+        model = self.model_artifact.value
+        processor = self.processor_artifact.value if self.processor_artifact is not None else sample.processor
+        if model is None or processor is None:
+            return
+
+        started = time.perf_counter()
+        try:
+            shadow = np.asarray(model.predict(processor.transform(sample.data)))
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Shadow model failed to score a sampled request: {e}")
+            return
+        shadow_seconds = time.perf_counter() - started
+
+        primary = np.asarray(sample.primary)
+        if shadow.shape != primary.shape:
+            self.failed += 1
+            logger.warning(f"Shadow predictions have shape {shadow.shape}, primary {primary.shape}")
+            return
+
+        agreed = int(agreement(primary, shadow).sum())
+        self.scored += 1
+        self.rows += len(primary)
+        self.agreed_rows += agreed
+        if np.issubdtype(primary.dtype, np.number) and np.issubdtype(shadow.dtype, np.number):
+            self.abs_diff_sum += float(np.abs(primary.astype(float) - shadow.astype(float)).sum())
+
+        SHADOW_SECONDS.observe(sample.primary_seconds, model="primary")
+        SHADOW_SECONDS.observe(shadow_seconds, model="shadow")
+        SHADOW_ROWS.inc(agreed, outcome="agree")
+        SHADOW_ROWS.inc(len(primary) - agreed, outcome="disagree")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "sampled": self.sampled,
+            "dropped": self.dropped,
+            "scored": self.scored,
+            "failed": self.failed,
+            "rows": self.rows,
+            "agreement_rate": self.agreed_rows / self.rows if self.rows else None,
+            "mean_abs_diff": self.abs_diff_sum / self.rows if self.rows else None,
+            "model_version": self.model_artifact.version,
+        }
@@ -0,0 +1,85 @@
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def request_key(*parts: bytes | str | int | None) -> bytes:
+    """Digest of everything that determines a request's result (route, headers, body, artifacts)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode()
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.digest()
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task
+    waiters: int = 1
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving while it runs
+    await the same task and receive its result or exception. A waiter that is cancelled
+    (deadline, disconnect) only detaches; the work itself is cancelled once no waiters are
+    left. At most `max_keys` flights are tracked, beyond that calls simply run unshared.
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._flights: dict[bytes, _Flight] = {}
+
+        self.leaders = 0
+        self.shared = 0
+        self.untracked = 0
+
+    async def do(self, key: bytes, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run `fn` or join the in-flight call for `key`. Returns the result and whether it was shared."""
+        flight = self._flights.get(key)
+        if flight is not None:
+            flight.waiters += 1
+            self.shared += 1
+            return await self._wait(key, flight), True
+
+        if len(self._flights) >= self.max_keys:
+            self.untracked += 1
+            return await fn(), False
+
+        flight = _Flight(task=asyncio.ensure_future(fn()))
+        self._flights[key] = flight
+        flight.task.add_done_callback(lambda task: self._finish(key, task))
+        self.leaders += 1
+        return await self._wait(key, flight), False
+
+    async def _wait(self, key: bytes, flight: _Flight) -> Any:
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            flight.waiters -= 1
+            if flight.waiters == 0:
+                flight.task.cancel()
+            raise
+
+    def _finish(self, key: bytes, task: asyncio.Task) -> None:
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter detached.
+            task.exception()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "shared": self.shared,
+            "untracked": self.untracked,
+        }
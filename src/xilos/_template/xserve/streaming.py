@@ -0,0 +1,196 @@
+import asyncio
+import io
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import pandas as pd
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic_core import from_json
+from starlette.types import Receive, Scope, Send
+
+from .codecs import ARROW_STREAM_CONTENT_TYPE, decompressor, media_type
+from .executor import InferenceExecutor
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+class BodyReader(io.RawIOBase):
+    """
+    Blocking file-like view over an async request body.
+
+    The event loop feeds decoded chunks through a bounded queue, which gives backpressure
+    towards the client, while a worker thread reads from it (e.g. a pyarrow IPC reader).
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_chunks: int = 8) -> None:
+        super().__init__()
+        self._loop = loop
+        self._chunks: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=max_chunks)
+        self._buffer = memoryview(b"")
+        self._eof = False
+
+    async def feed(self, chunk: bytes | None) -> None:
+        """Push a chunk from the event loop; None marks the end of the body."""
+        await self._chunks.put(chunk)
+
+    def abort(self) -> None:
+        """Unblock a waiting reader when the response is torn down early."""
+        while not self._chunks.empty():
+            self._chunks.get_nowait()
+        self._chunks.put_nowait(None)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        while not self._buffer and not self._eof:
+            chunk = asyncio.run_coroutine_threadsafe(self._chunks.get(), self._loop).result()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer = memoryview(chunk)
+
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for generators that are still reading the request body.
+
+    Starlette's StreamingResponse listens on `receive` for client disconnects while it
+    streams, which would swallow the body chunks the generator needs. Disconnects are
+    surfaced by the body stream itself instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _parse_ndjson(lines: list[bytes]) -> pd.DataFrame:
+    try:
+        return pd.DataFrame(from_json(b"[" + b",".join(lines) + b"]"))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid NDJSON: {e}") from e
+
+
+async def _ndjson_frames(
+    request: Request,
+    codec: Any,
+    chunk_rows: int,
+    executor: InferenceExecutor,
+    max_line_bytes: int,
+    max_chunk_bytes: int,
+) -> AsyncIterator[pd.DataFrame]:
+    pending = b""
+    lines: list[bytes] = []
+
+    async for chunk in request.stream():
+        pending += codec.decompress(chunk, max_chunk_bytes)
+        *complete, pending = pending.split(b"\n")
+        if len(pending) > max_line_bytes or any(len(line) > max_line_bytes for line in complete):
+            raise HTTPException(status_code=413, detail=f"NDJSON line exceeds {max_line_bytes} bytes.")
+        lines.extend(line for line in complete if line.strip())
+
+        while len(lines) >= chunk_rows:
+            batch, lines = lines[:chunk_rows], lines[chunk_rows:]
+            yield await executor.run(_parse_ndjson, batch)
+
+    if pending.strip():
+        lines.append(pending)
+    if lines:
+        yield await executor.run(_parse_ndjson, lines)
+
+
+def _arrow_chunks(reader: BodyReader, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    import pyarrow as pa
+
+    stream = pa.ipc.open_stream(reader)
+    batches: list[pa.RecordBatch] = []
+    rows = 0
+
+    for batch in stream:
+        batches.append(batch)
+        rows += batch.num_rows
+        while rows >= chunk_rows:
+            table = pa.Table.from_batches(batches, schema=stream.schema)
+            yield table.slice(0, chunk_rows).to_pandas()
+            batches = table.slice(chunk_rows).to_batches()
+            rows -= chunk_rows
+
+    if rows:
+        yield pa.Table.from_batches(batches, schema=stream.schema).to_pandas()
+
+
+async def _arrow_frames(
+    request: Request,
+    codec: Any,
+    chunk_rows: int,
+    max_chunk_bytes: int,
+) -> AsyncIterator[pd.DataFrame]:
+    reader = BodyReader(asyncio.get_running_loop())
+
+    async def _produce() -> None:
+        try:
+            async for chunk in request.stream():
+                await reader.feed(codec.decompress(chunk, max_chunk_bytes))
+        except Exception:
+            reader.abort()  # The reader sees a truncated stream; the failure is raised below
+            raise
+        await reader.feed(None)
+
+    def _producer_failure() -> BaseException | None:
+        return producer.exception() if producer.done() and not producer.cancelled() else None
+
+    producer = asyncio.create_task(_produce())
+    chunks = _arrow_chunks(reader, chunk_rows)
+    try:
+        # The reader blocks while the body arrives, so it runs on its own thread rather than
+        # holding one of the inference workers.
+        while True:
+            try:
+                frame = await asyncio.to_thread(next, chunks, None)
+            except Exception:
+                if (failure := _producer_failure()) is not None:
+                    raise failure from None
+                raise
+            if frame is None:
+                break
+            yield frame
+        if (failure := _producer_failure()) is not None:
+            raise failure
+    finally:
+        producer.cancel()
+        reader.abort()
+
+
+def stream_frames(
+    request: Request,
+    chunk_rows: int,
+    executor: InferenceExecutor,
+    max_line_bytes: int,
+    max_chunk_bytes: int,
+) -> AsyncIterator[pd.DataFrame]:
+    """
+    Read an NDJSON or Arrow IPC request body as a sequence of frames of at most `chunk_rows` rows.
+    An NDJSON line longer than `max_line_bytes`, or a received chunk that decompresses to more
+    than `max_chunk_bytes`, is rejected with 413.
+    """
+    codec = decompressor(request.headers.get("content-encoding"))
+    mtype = media_type(request.headers.get("content-type"))
+
+    if mtype == ARROW_STREAM_CONTENT_TYPE:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise HTTPException(status_code=415, detail="Arrow payloads require the pyarrow package.") from e
+        return _arrow_frames(request, codec, chunk_rows, max_chunk_bytes)
+    if mtype in (NDJSON_CONTENT_TYPE, "application/jsonl"):
+        return _ndjson_frames(request, codec, chunk_rows, executor, max_line_bytes, max_chunk_bytes)
+
+    raise HTTPException(status_code=415, detail=f"Unsupported Content-Type for streaming: {mtype}")
@@ -0,0 +1,40 @@
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+
+def _input_columns(processor: Any) -> list[str] | None:
+    """Columns the fitted processor (or its sklearn pipeline) was fitted on, if recorded."""
+    for owner in (processor, getattr(processor, "pipeline", None)):
+        columns = getattr(owner, "feature_names_in_", None)
+        if columns is not None:
+            return list(columns)
+    return None
+
+
+def warmup_frame(processor: Any, rows: int, path: str = "") -> pd.DataFrame | None:
+    """
+    Build the synthetic batch used to warm up the model.
+
+    A sample file (parquet, json, jsonl or csv) at `path` takes precedence; otherwise an
+    all-zero frame is built from the processor's fitted input columns.
+    """
+    if path:
+        suffix = Path(path).suffix.lower()
+        if suffix == ".parquet":
+            sample = pd.read_parquet(path)
+        elif suffix in (".json", ".jsonl"):
+            sample = pd.read_json(path, lines=suffix == ".jsonl")
+        else:
+            sample = pd.read_csv(path)
+        return sample.head(rows)
+
+    columns = _input_columns(processor)
+    if columns is None:
+        logger.warning("Warmup skipped: processor does not expose its input columns and SERVE_WARMUP_PATH is unset.")
+        return None
+
+    return pd.DataFrame(np.zeros((rows, len(columns))), columns=columns)
@@ -0,0 +1,147 @@
+"""
+Parity check and benchmark of the pandas and polars example processors.
+
+Writes a synthetic Parquet dataset, fits and transforms it with `ExampleProcessor` (eager
+pandas, as `fit` + `transform` and as a single `fit_transform`) and `PolarsExampleProcessor`
+(lazy polars query over `pl.scan_parquet`), each in a fresh process, and prints the timings,
+peak resident memory and largest difference from the first case's output as JSON:
+
+    python -m xilos.xtrain.benchmark --rows 1000000 --features 20
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import resource
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from .processor.lazy import PolarsExampleProcessor
+from .processor.processor import ExampleProcessor
+
+
+def make_dataset(path: Path, rows: int, features: int, missing: float, seed: int) -> None:
+    """Numeric features with missing values, a text column and ~1% duplicated rows."""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(loc=rng.uniform(-5, 5, features), scale=rng.uniform(0.5, 3, features), size=(rows, features))
+    values[rng.random(values.shape) < missing] = np.nan
+
+    frame = pd.DataFrame(values, columns=[f"x{i}" for i in range(features)])
+    frame["category"] = rng.choice(["a", "b", "c"], size=rows)
+    sources, targets = rng.choice(rows, size=(2, rows // 100), replace=False)
+    frame.iloc[targets] = frame.iloc[sources].to_numpy()
+    frame.to_parquet(path, index=False)
+
+
+def _timed(fn: Callable[[], Any]) -> tuple[Any, float]:
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def run_pandas(path: Path) -> tuple[pd.DataFrame, dict[str, float]]:
+    processor = ExampleProcessor()
+    data, read = _timed(lambda: pd.read_parquet(path))
+    _, fit = _timed(lambda: processor.fit(data))
+    result, transform = _timed(lambda: processor.transform(data))
+    return result, {"read": read, "fit": fit, "transform": transform}
+
+
+def run_pandas_fit_transform(path: Path) -> tuple[pd.DataFrame, dict[str, float]]:
+    processor = ExampleProcessor()
+    data, read = _timed(lambda: pd.read_parquet(path))
+    result, fit_transform = _timed(lambda: processor.fit_transform(data))
+    return result, {"read": read, "fit_transform": fit_transform}
+
+
+def run_polars(path: Path) -> tuple[pl.DataFrame, dict[str, float]]:
+    processor = PolarsExampleProcessor()
+    # The scan is only a plan: every step reads just the columns it needs from the file.
+    _, fit = _timed(lambda: processor.fit(pl.scan_parquet(path)))
+    result, transform = _timed(lambda: processor.transform(pl.scan_parquet(path)))
+    return result, {"fit": fit, "transform": transform}
+
+
+CASES: dict[str, Callable[[Path], tuple[Any, dict[str, float]]]] = {
+    "pandas": run_pandas,
+    "pandas_fit_transform": run_pandas_fit_transform,
+    "polars": run_polars,
+}
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _run_case(name: str, path: Path, output: Path) -> dict[str, Any]:
+    """Run one case in a fresh process, so its peak RSS is not shadowed by an earlier case."""
+    baseline = _peak_rss_mb()
+    result, seconds = CASES[name](path)
+    peak = _peak_rss_mb()
+    np.save(output, result.to_numpy())
+    return {
+        "seconds": {**seconds, "total": sum(seconds.values())},
+        "baseline_rss_mb": baseline,
+        "peak_rss_mb": peak,
+    }
+
+
+def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    report: dict[str, Any] = {"rows": args.rows, "features": args.features, "cases": {}}
+    with tempfile.TemporaryDirectory(prefix="xtrain-bench-") as folder:
+        path = Path(folder) / "data.parquet"
+        make_dataset(path, args.rows, args.features, args.missing, args.seed)
+
+        for name in args.cases:
+            with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+                report["cases"][name] = pool.submit(_run_case, name, path, Path(folder) / f"{name}.npy").result()
+
+        # Every case is compared with the first one.
+        expected = np.load(Path(folder) / f"{args.cases[0]}.npy", mmap_mode="r")
+        report["shape"] = list(expected.shape)
+        report["parity"] = True
+        for name in args.cases:
+            actual = np.load(Path(folder) / f"{name}.npy", mmap_mode="r")
+            diff = float(np.nanmax(np.abs(expected - actual))) if actual.shape == expected.shape else None
+            report["cases"][name]["max_abs_diff"] = diff
+            report["parity"] = report["parity"] and diff is not None and diff <= args.tolerance
+            del actual
+        del expected
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare the pandas and polars example processors.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--missing", type=float, default=0.05, help="Fraction of missing feature values.")
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="Largest output difference counted as parity.")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES), help="Processors to run.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = json.dumps(run_benchmark(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
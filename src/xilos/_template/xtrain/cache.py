@@ -0,0 +1,229 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+from collections.abc import Callable
+from datetime import UTC, datetime
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+import pandas as pd
+import polars as pl
+from loguru import logger
+
+MANIFEST = "manifest.json"
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable digest of strings, bytes and JSON-serializable values."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        data = part if isinstance(part, bytes) else json.dumps(part, sort_keys=True, default=str).encode()
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def code_fingerprint(*objects: Any, packages: tuple[str, ...] = ("numpy", "pandas", "polars", "scikit-learn")) -> str:
+    """Digest of the source files defining `objects` and of the installed versions of `packages`."""
+    sources = []
+    for obj in objects:
+        path = Path(inspect.getfile(obj if inspect.ismodule(obj) or inspect.isclass(obj) else type(obj)))
+        sources.append(path.read_bytes())
+
+    versions = []
+    for package in packages:
+        try:
+            versions.append(f"{package}=={version(package)}")
+        except PackageNotFoundError:
+            versions.append(f"{package}==missing")
+    return fingerprint(*sources, versions)
+
+
+def _write(value: Any, path: Path) -> str:
+    """Write one stage output and return its file name."""
+    if isinstance(value, pl.DataFrame):
+        name = f"{path.name}.pl.parquet"
+        value.write_parquet(path.with_name(name))
+    elif isinstance(value, pd.DataFrame):
+        name = f"{path.name}.pd.parquet"
+        value.to_parquet(path.with_name(name))
+    elif isinstance(value, pd.Series):
+        name = f"{path.name}.series.parquet"
+        value.to_frame().to_parquet(path.with_name(name))
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        name = f"{path.name}.npy"
+        np.save(path.with_name(name), value)
+    else:
+        name = f"{path.name}.joblib"
+        joblib.dump(value, path.with_name(name))
+    return name
+
+
+def _read(path: Path) -> Any:
+    name = path.name
+    if name.endswith(".pl.parquet"):
+        return pl.read_parquet(path)
+    if name.endswith(".pd.parquet"):
+        return pd.read_parquet(path)
+    if name.endswith(".series.parquet"):
+        return pd.read_parquet(path).iloc[:, 0]
+    if name.endswith(".npy"):
+        return np.load(path)
+    return joblib.load(path)
+
+
+class StageResult:
+    """Outputs of a pipeline stage, identified by the digest of their content and loaded on first access."""
+
+    def __init__(self, stage: str, directory: Path, digest: str, files: dict[str, str]) -> None:
+        self.stage = stage
+        self.directory = directory
+        self.digest = digest
+        self.files = files
+        self._values: dict[str, Any] | None = None
+
+    @property
+    def values(self) -> dict[str, Any]:
+        if self._values is None:
+            self._values = {key: _read(self.directory / name) for key, name in self.files.items()}
+        return self._values
+
+    def __getitem__(self, key: str) -> Any:
+        return self.values[key]
+
+
+class StageCache:
+    """
+    Content-addressed cache of training pipeline stage outputs on local disk.
+
+    A stage is stored under `root/<stage>/<key>/`, where the key is a digest of the stage name,
+    the content digests of its inputs, its parameters and the code fingerprint. Its outputs are
+    written as Parquet (DataFrames, Series), NPY (arrays) or joblib (anything else), and a
+    manifest is written last, so an interrupted stage is simply recomputed. Because keys chain
+    through content digests, a cache hit never needs to load the upstream outputs, and a rerun
+    after a crash resumes at the first stage without a valid entry.
+
+    After every store, entries not used for `max_age_seconds` are removed, then the least
+    recently used ones until the cache holds at most `max_bytes`. Entries used by this
+    instance are never removed.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        code_version: str,
+        enabled: bool = True,
+        max_bytes: int | None = None,
+        max_age_seconds: float | None = None,
+    ) -> None:
+        self.root = Path(root)
+        self.code_version = code_version
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._used: set[Path] = set()
+
+    def run(
+        self,
+        stage: str,
+        fn: Callable[..., dict[str, Any]],
+        inputs: tuple[StageResult, ...] = (),
+        params: Any = None,
+        reuse: bool = True,
+    ) -> StageResult:
+        """
+        Return the cached outputs of `stage` or compute them with `fn(*input_values)` and store them.
+        With `reuse=False` the stage is always computed, for inputs the key cannot identify (e.g. a
+        download of unversioned data); its outputs are still stored, so unchanged content keeps the
+        downstream stages cached.
+        """
+        key = fingerprint(stage, self.code_version, [result.digest for result in inputs], params)
+        directory = self.root / stage / key
+
+        if self.enabled and reuse:
+            cached = self._load(stage, directory)
+            if cached is not None:
+                logger.info(f"Stage {stage}: cache hit ({key[:12]})")
+                self._touch(directory)
+                return cached
+
+        logger.info(f"Stage {stage}: computing ({key[:12]})")
+        outputs = fn(*[result.values for result in inputs])
+        if not self.enabled:
+            # Without storage the key stands in for the content digest of the outputs.
+            result = StageResult(stage, directory, key, {})
+        else:
+            result = self._store(stage, directory, outputs)
+            self._touch(directory)
+            self.prune()
+        result._values = outputs
+        return result
+
+    def prune(self) -> None:
+        """Remove expired entries, then the least recently used ones above the size limit."""
+        if self.max_bytes is None and self.max_age_seconds is None:
+            return
+
+        entries = []
+        for manifest in self.root.glob(f"*/*/{MANIFEST}"):
+            directory = manifest.parent
+            try:
+                used = manifest.stat().st_mtime
+                size = sum(path.stat().st_size for path in directory.iterdir())
+            except FileNotFoundError:  # Removed concurrently
+                continue
+            entries.append((used, size, directory))
+
+        now = datetime.now(UTC).timestamp()
+        total = sum(size for _, size, _ in entries)
+        for used, size, directory in sorted(entries, key=lambda entry: entry[0]):
+            expired = self.max_age_seconds is not None and now - used > self.max_age_seconds
+            oversized = self.max_bytes is not None and total > self.max_bytes
+            if directory in self._used or not (expired or oversized):
+                continue
+            logger.info(f"Stage {directory.parent.name}: evicting {directory.name[:12]} ({size / 1024**2:.1f} MB)")
+            shutil.rmtree(directory, ignore_errors=True)
+            total -= size
+
+    def _touch(self, directory: Path) -> None:
+        # The manifest's modification time records when the entry was last used.
+        self._used.add(directory)
+        os.utime(directory / MANIFEST)
+
+    def _load(self, stage: str, directory: Path) -> StageResult | None:
+        try:
+            manifest = json.loads((directory / MANIFEST).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if not all((directory / name).is_file() for name in manifest["files"].values()):
+            return None
+        return StageResult(stage, directory, manifest["digest"], manifest["files"])
+
+    def _store(self, stage: str, directory: Path, outputs: dict[str, Any]) -> StageResult:
+        staging = directory.with_name(f".{directory.name}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        files = {key: _write(value, staging / key) for key, value in outputs.items()}
+        digest = hashlib.blake2b(digest_size=16)
+        for key in sorted(files):
+            with open(staging / files[key], "rb") as f:
+                digest.update(hashlib.file_digest(f, "blake2b").digest())
+
+        manifest = {
+            "stage": stage,
+            "digest": digest.hexdigest(),
+            "files": files,
+            "created": datetime.now(UTC).isoformat(),
+        }
+        (staging / MANIFEST).write_text(json.dumps(manifest, indent=2))
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(staging, directory)
+        return StageResult(stage, directory, manifest["digest"], files)
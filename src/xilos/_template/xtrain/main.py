@@ -1,14 +1,58 @@
+import copy
+import json
+import os
+import shutil
 import sys
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
 
+import joblib
+import numpy as np
+import pandas as pd
+import polars as pl
 from loguru import logger
+from sklearn.base import is_classifier
 from sklearn.model_selection import train_test_split
 
-from ..config import project_config
-from ..xcore.xmodel import XModel
+from ..config import project_config, timestamp
+from ..xcore.xmodel import XModel, version_key
 from ..xcore.xprocessor import DataProcessor
 from ..xcore.xstore import DataStorage, DataTable
+from .cache import StageCache, code_fingerprint
 from .model import MLModel
+from .processor.compaction import DtypeCompactor
 from .processor.processor import ExampleProcessor
+from .tuning import tune
+
+TRAINING_METADATA = "training.json"
+
+
+def _split(df: pd.DataFrame, target: str, test_size: float, seed: int) -> dict[str, Any]:
+    X_train, X_test, y_train, y_test = train_test_split(
+        df.drop(columns=[target]),
+        df[target],
+        test_size=test_size,
+        random_state=seed,
+    )
+    return {"X_train": X_train, "X_test": X_test, "y_train": y_train, "y_test": y_test}
+
+
+def _fit_transform(processor: DataProcessor, split: dict[str, Any]) -> dict[str, Any]:
+    # One pass over the training rows fits the processor and yields their features.
+    X_train = processor.fit_transform(split["X_train"])
+    return {"processor": processor, "X_train": X_train}
+
+
+def _transform(split: dict[str, Any], fitted: dict[str, Any]) -> dict[str, Any]:
+    X_train, X_test = fitted["X_train"], fitted["processor"].transform(split["X_test"])
+    # The processor may drop rows (duplicates); align the targets on the surviving index.
+    return {
+        "X_train": X_train,
+        "X_test": X_test,
+        "y_train": split["y_train"].loc[X_train.index],
+        "y_test": split["y_test"].loc[X_test.index],
+    }
 
 
 def run_training_pipeline(
@@ -17,44 +61,285 @@ def run_training_pipeline(
     processor: DataProcessor,
     model: XModel,
 ):
-    """Main training pipeline execution."""
+    """
+    Main training pipeline execution.
+
+    Every preprocessing stage goes through a `StageCache` under TRAIN_CACHE_DIR, keyed by its
+    input data, the processor configuration and the code version: reruns that only change the
+    model reuse the prepared features, and a crashed run resumes after its last completed stage.
+    """
     logger.info(f"Starting training pipeline for {project_config}...")
+    target = project_config.TRAIN_TARGET
+    cache = StageCache(
+        root=project_config.TRAIN_CACHE_DIR,
+        code_version=code_fingerprint(processor, DtypeCompactor, sys.modules[__name__]),
+        enabled=project_config.TRAIN_CACHE,
+        # A limit of 0 disables it.
+        max_bytes=int(project_config.TRAIN_CACHE_MAX_GB * 1024**3) or None,
+        max_age_seconds=project_config.TRAIN_CACHE_MAX_AGE_DAYS * 86_400 or None,
+    )
+
+    compactor = getattr(processor, "compactor", None)
 
-    # 1. Load data
-    df = data_storage.download_dataframe(
-        cloud_path=project_config.cloud_path,
-        save_path=None,
+    def download() -> dict[str, Any]:
+        df = data_storage.download_dataframe(cloud_path=project_config.TRAIN_DATA_PATH, save_path=None).to_pandas()
+        if compactor is not None:
+            # Compact before any other stage holds a copy; the processor refits its own schema.
+            df = copy.deepcopy(compactor).fit_transform(df)
+        return {"data": df}
+
+    # 1. Load data. The path does not identify its content, so the download is only reused when
+    # TRAIN_DATA_VERSION names it; otherwise it runs every time and unchanged data still hits below.
+    raw = cache.run(
+        "download",
+        download,
+        params={
+            "source": project_config.TRAIN_DATA_PATH,
+            "version": project_config.TRAIN_DATA_VERSION,
+            "compactor": joblib.hash(compactor),
+        },
+        reuse=bool(project_config.TRAIN_DATA_VERSION),
     )
 
-    df = processor.clean_data(df)
-    df = processor.fit(df)
-    df = processor.transform(df)
-    df = processor.feature_engineer(df)
+    # Deduplicate the whole frame before splitting, so that no row lands in both train and test.
+    cleaned = cache.run("clean", lambda raw: {"data": processor.clean_data(raw["data"])}, inputs=(raw,))
 
-    # 2. Split data
-    X = df.drop(columns=["target"])
-    y = df["target"]
-    X_train, X_test, y_train, y_test = train_test_split(
-        X,
-        y,
-        test_size=0.2,
-        random_state=project_config.RANDOM_SEED,
+    # 2. Split data, then fit the processor on the training rows only, in one fit_transform pass.
+    split = cache.run(
+        "split",
+        lambda cleaned: _split(cleaned["data"], target, 0.2, project_config.RANDOM_SEED),
+        inputs=(cleaned,),
+        params={"target": target, "test_size": 0.2, "seed": project_config.RANDOM_SEED},
+    )
+    fitted = cache.run(
+        "fit",
+        lambda split: _fit_transform(processor, split),
+        inputs=(split,),
+        params=joblib.hash(processor),
     )
+    features = cache.run("transform", _transform, inputs=(split, fitted))
+    processor = fitted["processor"]
+    X_train, y_train = features["X_train"], features["y_train"]
+
+    # 3. Tune and train model
+    if project_config.TUNE:
+        tune(
+            model,
+            X_train,
+            y_train,
+            param_space=project_config.TUNE_PARAM_SPACE,
+            n_candidates=project_config.TUNE_CANDIDATES,
+            cv=project_config.TUNE_CV_FOLDS,
+            factor=project_config.TUNE_FACTOR,
+            resource=project_config.TUNE_RESOURCE,
+            scoring=project_config.TUNE_SCORING,
+            n_jobs=project_config.TUNE_N_JOBS,
+            random_state=project_config.RANDOM_SEED,
+        )
 
-    # 3. Train model
     logger.info("Initializing model...")
     model.train(X_train, y_train)
 
     # 4. Save Artifacts
-    model.save(project_config.model_output_path)
+    processor.save(project_config.PROCESSOR_PATH)
+    model.save(project_config.MODEL_PATH)
     logger.info("Pipeline finished successfully.")
 
 
+def run_streaming_training_pipeline(
+    data_storage: DataStorage,
+    processor: DataProcessor,
+    model: MLModel,
+    source: str,
+    target: str,
+    batch_rows: int,
+    epochs: int = 1,
+):
+    """
+    Out-of-core training pipeline.
+
+    The Parquet source is scanned lazily in chunks of `batch_rows` rows and never held in
+    memory as a whole. A first pass fits the processor incrementally (and collects the labels
+    of a classifier); each of the `epochs` following passes trains the model chunk by chunk.
+    """
+    logger.info(f"Starting streaming training pipeline on {source}...")
+
+    # 1. Fit processor statistics
+    collect_classes = is_classifier(model.model)
+    classes, rows = set(), 0
+    for batch in data_storage.scan_batches(source, batch_rows):
+        chunk = batch.to_pandas()
+        processor.partial_fit(chunk.drop(columns=[target]))
+        if collect_classes:
+            classes.update(chunk[target].dropna().unique().tolist())
+        rows += len(chunk)
+    logger.info(f"Processor fitted on {rows} rows")
+
+    # 2. Train model
+    labels = np.array(sorted(classes)) if collect_classes else None
+    for epoch in range(epochs):
+        for batch in data_storage.scan_batches(source, batch_rows):
+            chunk = batch.to_pandas()
+            X = processor.transform(chunk.drop(columns=[target]))
+            # The processor may drop rows (duplicates); align the target on the surviving index.
+            model.partial_train(X, chunk.loc[X.index, target], classes=labels)
+        logger.info(f"Epoch {epoch + 1}/{epochs} complete")
+
+    # 3. Save Artifacts
+    processor.save(project_config.PROCESSOR_PATH)
+    model.save(project_config.MODEL_PATH)
+    logger.info("Streaming pipeline finished successfully.")
+
+
+def _latest_version(model_dir: Path) -> Path | None:
+    """Newest complete version directory, by the same rule as the serving `latest` alias."""
+    if not model_dir.is_dir():
+        return None
+    versions = sorted(
+        (
+            path
+            for path in model_dir.iterdir()
+            if not path.is_symlink() and not path.name.startswith(".") and (path / "model").is_file()
+        ),
+        key=lambda path: version_key(path.name),
+    )
+    return versions[-1] if versions else None
+
+
+def _watermark_literal(watermark: Any, dtype: pl.DataType) -> pl.Expr:
+    # Dates and timestamps are stored in ISO format in the training metadata.
+    if dtype in (pl.Date, pl.Datetime, pl.Time):
+        return pl.lit(watermark).str.strptime(dtype)
+    return pl.lit(watermark).cast(dtype)
+
+
+def run_incremental_training_pipeline(
+    data_storage: DataStorage,
+    processor: DataProcessor,
+    model: MLModel,
+    source: str,
+    target: str,
+    partition_column: str,
+    repository_dir: str | Path,
+    model_name: str,
+    batch_rows: int,
+    epochs: int = 1,
+) -> Path | None:
+    """
+    Warm-start retraining on the partitions added since the previous version.
+
+    The newest version in `repository_dir/model_name/<version>/` (the layout served by
+    `ModelRepository`) is loaded with its watermark, the largest `partition_column` value it
+    was trained on. Only rows above the watermark are scanned, so a Hive-partitioned source
+    (`partition_column=value/` directories) skips older partitions entirely. The processor
+    statistics are updated with `partial_fit`, the model continues with `partial_train`
+    (`partial_fit` or further boosting rounds), and the result is saved as a new version.
+    Without a previous version, `processor` and `model` are trained on the whole source.
+    Returns the new version directory, or None when there was no new data.
+    """
+    model_dir = Path(repository_dir) / model_name
+    previous = _latest_version(model_dir)
+    predicate, watermark = None, None
+    if previous is not None:
+        metadata_path = previous / TRAINING_METADATA
+        if not metadata_path.is_file():
+            raise FileNotFoundError(f"{previous} has no {TRAINING_METADATA}: its training watermark is unknown")
+        watermark = json.loads(metadata_path.read_text())["watermark"]
+        processor = processor.load(previous / "processor")
+        model = model.load(previous / "model")
+
+        dtype = data_storage.scan_schema(source)[partition_column]
+        predicate = pl.col(partition_column) > _watermark_literal(watermark, dtype)
+        logger.info(f"Warm-starting from {previous}, ingesting {partition_column} > {watermark}")
+    else:
+        logger.info(f"No previous version of {model_name}, training from scratch on {source}")
+
+    # 1. Update processor statistics
+    collect_classes = previous is None and is_classifier(model.model)
+    classes, rows, latest = set(), 0, None
+    for batch in data_storage.scan_batches(source, batch_rows, predicate=predicate):
+        chunk = batch.to_pandas()
+        processor.partial_fit(chunk.drop(columns=[target, partition_column]))
+        if collect_classes:
+            classes.update(chunk[target].dropna().unique().tolist())
+        batch_latest = batch.get_column(partition_column).max()
+        latest = batch_latest if latest is None or batch_latest > latest else latest
+        rows += len(chunk)
+
+    if rows == 0:
+        logger.info(f"No data newer than the watermark {watermark}; nothing to retrain")
+        return None
+    logger.info(f"Processor updated with {rows} new rows up to {partition_column}={latest}")
+
+    # 2. Continue training the model
+    labels = np.array(sorted(classes)) if collect_classes else None
+    for epoch in range(epochs):
+        for batch in data_storage.scan_batches(source, batch_rows, predicate=predicate):
+            chunk = batch.to_pandas()
+            X = processor.transform(chunk.drop(columns=[target, partition_column]))
+            # The processor may drop rows (duplicates); align the target on the surviving index.
+            model.partial_train(X, chunk.loc[X.index, target], classes=labels)
+        logger.info(f"Epoch {epoch + 1}/{epochs} complete")
+
+    # 3. Save the new version; it only becomes visible once complete.
+    version = timestamp()
+    staging = model_dir / f".{version}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    processor.save(staging / "processor")
+    model.save(staging / "model")
+    metadata = {
+        "watermark": latest,
+        "partition_column": partition_column,
+        "parent": previous.name if previous is not None else None,
+        "rows": rows,
+        "created": datetime.now(UTC).isoformat(),
+    }
+    (staging / TRAINING_METADATA).write_text(json.dumps(metadata, indent=2, default=str))
+    version_dir = model_dir / version
+    os.replace(staging, version_dir)
+    logger.info(f"Incremental pipeline finished successfully: {version_dir}")
+    return version_dir
+
+
 def main() -> None:
     """Entry point."""
+    compactor = None
+    if project_config.TRAIN_COMPACT_DTYPES:
+        compactor = DtypeCompactor(
+            category_max_ratio=project_config.TRAIN_COMPACT_CATEGORY_RATIO,
+            float32=project_config.TRAIN_COMPACT_FLOAT32,
+        )
+
     try:
+        if project_config.TRAIN_INCREMENTAL:
+            run_incremental_training_pipeline(
+                data_storage=None,  # Placeholder, as for the in-memory pipeline below
+                processor=ExampleProcessor(compactor=compactor),
+                model=MLModel(),
+                source=project_config.TRAIN_DATA_PATH,
+                target=project_config.TRAIN_TARGET,
+                partition_column=project_config.TRAIN_PARTITION_COLUMN,
+                repository_dir=project_config.MODEL_REPOSITORY_DIR,
+                model_name=project_config.TRAIN_MODEL_NAME,
+                batch_rows=project_config.TRAIN_BATCH_ROWS,
+                epochs=project_config.TRAIN_EPOCHS,
+            )
+            return
+
+        if project_config.TRAIN_STREAMING:
+            run_streaming_training_pipeline(
+                data_storage=None,  # Placeholder, as for the in-memory pipeline below
+                processor=ExampleProcessor(compactor=compactor),
+                model=MLModel(),
+                source=project_config.TRAIN_DATA_PATH,
+                target=project_config.TRAIN_TARGET,
+                batch_rows=project_config.TRAIN_BATCH_ROWS,
+                epochs=project_config.TRAIN_EPOCHS,
+            )
+            return
+
         run_training_pipeline(
-            processor=ExampleProcessor(),
+            processor=ExampleProcessor(compactor=compactor),
             model=MLModel(),
             # In a real scenario, storage/table should be passed here too or injected
             data_storage=None,  # Placeholder or mock if not available in template main
@@ -1,10 +1,14 @@
 import abc
+import os
 from pathlib import Path
 from typing import Any
 
 import joblib
 import pandas as pd
 from loguru import logger
+from sklearn.base import is_classifier
+from sklearn.exceptions import NotFittedError
+from sklearn.utils.validation import check_is_fitted
 
 from ..xcore.xmodel import XModel
 
@@ -25,21 +29,72 @@ class MLModel(XModel):
         self.model.fit(X, y)
         logger.info("Training complete.")
 
+    def partial_train(self, X: pd.DataFrame, y: pd.Series, classes: Any = None) -> None:
+        """
+        Continue training on one chunk of data.
+
+        Estimators with `partial_fit` (SGD, naive Bayes, MLP, ...) are updated in place; `classes`
+        must list every label on the first call for classifiers. XGBoost and LightGBM models add
+        boosting rounds on top of the booster trained so far.
+        """
+        if hasattr(self.model, "partial_fit"):
+            kwargs = {"classes": classes} if classes is not None and is_classifier(self.model) else {}
+            self.model.partial_fit(X, y, **kwargs)
+            return
+
+        try:
+            check_is_fitted(self.model)
+            fitted = True
+        except NotFittedError:
+            fitted = False
+
+        module = type(self.model).__module__
+        if module.startswith("xgboost"):
+            self.model.fit(X, y, xgb_model=self.model.get_booster() if fitted else None)
+        elif module.startswith("lightgbm"):
+            self.model.fit(X, y, init_model=self.model.booster_ if fitted else None)
+        else:
+            raise TypeError(f"{type(self.model).__name__} supports neither partial_fit nor continued boosting.")
+
     def predict(self, X: pd.DataFrame) -> Any:
         """Make predictions."""
         return self.model.predict(X)
 
     def save(self, path: str | Path) -> None:
-        """Save model to disk."""
+        """
+        Save model to disk.
+
+        The artifact is written uncompressed so its numpy arrays can be memory-mapped, and
+        it replaces any previous file atomically: processes that still map the old file keep
+        reading the old inode instead of a truncated one.
+        """
         logger.info(f"Saving model to {path}...")
-        Path(path).parent.mkdir(parents=True, exist_ok=True)
-        joblib.dump(self.model, path)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        joblib.dump(self.model, tmp_path)
+        os.replace(tmp_path, path)
         logger.info("Model saved.")
 
     @classmethod
-    def load(cls, path: str | Path) -> "MLModel":
-        """Load model from disk."""
+    def load(cls, path: str | Path, mmap_mode: str | None = None) -> "MLModel":
+        """
+        Load model from disk.
+
+        With `mmap_mode="r"` the numpy arrays inside the artifact are memory-mapped read-only
+        instead of copied, so processes loading the same file share the page cache.
+        """
         logger.info(f"Loading model from {path}...")
         instance = cls.__new__(cls)
-        instance.model = joblib.load(path)
+        instance.model = joblib.load(path, mmap_mode=mmap_mode)
         return instance
+
+
+class ServingModel(MLModel):
+    """Concrete MLModel for loading and serving a saved estimator of any type."""
+
+    def _build_model(self, **kwargs) -> Any:
+        raise NotImplementedError("ServingModel is for loading existing models only.")
+
+    def fit(self, x: pd.DataFrame, y: pd.Series) -> None:
+        self.train(x, y)
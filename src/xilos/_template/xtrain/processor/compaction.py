@@ -0,0 +1,89 @@
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+_INTEGER_DTYPES = [np.dtype(np.int8), np.dtype(np.int16), np.dtype(np.int32), np.dtype(np.int64)]
+_UNSIGNED_DTYPES = [np.dtype(np.uint8), np.dtype(np.uint16), np.dtype(np.uint32), np.dtype(np.uint64)]
+_FLOAT32_MAX = float(np.finfo(np.float32).max)
+
+
+def _is_text(values: pd.Series) -> bool:
+    return pd.api.types.is_string_dtype(values.dtype) or values.dtype == object
+
+
+def _fits(values: pd.Series, dtype: np.dtype) -> bool:
+    """Whether every value of a numeric column is representable in `dtype`."""
+    if values.empty:
+        return True
+    if dtype.kind == "f":
+        peak = np.nanmax(np.abs(values.to_numpy(dtype=np.float64, na_value=np.nan)), initial=0.0)
+        return not peak > _FLOAT32_MAX
+    info = np.iinfo(dtype)
+    return info.min <= values.min() and values.max() <= info.max
+
+
+class DtypeCompactor:
+    """
+    Stores every column in the narrowest dtype that holds its values.
+
+    `fit` chooses the schema: integers get the smallest width covering their range (unsigned
+    widths for unsigned input), floats become float32 (when `float32` is set), and text columns
+    with at most `category_max_ratio` distinct values per row become categoricals of sortable
+    values. `transform` applies the fitted schema, so serving sees the dtypes the processor was
+    trained on. Apart from float precision it never changes a value: a column the schema cannot
+    represent (an integer out of range, an unseen category) keeps its dtype.
+    """
+
+    def __init__(self, category_max_ratio: float = 0.5, float32: bool = True) -> None:
+        self.category_max_ratio = category_max_ratio
+        self.float32 = float32
+        self.schema_: dict[str, Any] = {}
+
+    def fit(self, X: pd.DataFrame, y=None) -> "DtypeCompactor":
+        self.schema_ = {}
+        for name, values in X.items():
+            dtype = values.dtype
+            if pd.api.types.is_bool_dtype(dtype):
+                continue
+            if pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype):
+                widths = _UNSIGNED_DTYPES if dtype.kind == "u" else _INTEGER_DTYPES
+                self.schema_[name] = next((compact for compact in widths if _fits(values, compact)), dtype)
+            elif pd.api.types.is_float_dtype(dtype) and isinstance(dtype, np.dtype):
+                if self.float32 and _fits(values, np.dtype(np.float32)):
+                    self.schema_[name] = np.dtype(np.float32)
+            elif isinstance(dtype, pd.CategoricalDtype):
+                self.schema_[name] = dtype
+            elif _is_text(values) and len(values):
+                try:
+                    categories = values.dropna().unique()
+                except TypeError:  # Unhashable values
+                    continue
+                if len(categories) <= self.category_max_ratio * len(values):
+                    try:
+                        categories = pd.Index(categories).sort_values()
+                    except TypeError:  # Values of mixed types cannot be ordered
+                        continue
+                    self.schema_[name] = pd.CategoricalDtype(categories)
+        return self
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        dtypes = {}
+        for name, dtype in self.schema_.items():
+            if name not in X.columns or X[name].dtype == dtype:
+                continue
+            values = X[name]
+            if isinstance(dtype, pd.CategoricalDtype):
+                if _is_text(values) and values.dropna().isin(dtype.categories).all():
+                    dtypes[name] = dtype
+            elif pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+                if dtype.kind == "f" or pd.api.types.is_integer_dtype(values.dtype):
+                    if _fits(values, dtype):
+                        dtypes[name] = dtype
+            if name not in dtypes:
+                logger.debug(f"Column {name} ({values.dtype}) does not fit the compact dtype {dtype}; left as is")
+        return X.astype(dtypes) if dtypes else X
+
+    def fit_transform(self, X: pd.DataFrame, y=None) -> pd.DataFrame:
+        return self.fit(X).transform(X)
@@ -0,0 +1,68 @@
+import numpy as np
+import polars as pl
+import polars.selectors as cs
+
+from ...xcore.xprocessor import LazyDataProcessor
+
+
+class PolarsExampleProcessor(LazyDataProcessor):
+    """
+    Polars port of ExampleProcessor: drop duplicates, keep numeric columns, impute missing
+    values with the column mean and standardize.
+
+    Fitting computes every column's statistics in a single pass of one query; transforming
+    is one projection, fused with the cleaning and feature steps.
+    """
+
+    def __init__(self):
+        self.statistics_: dict[str, tuple[float, float]] = {}
+        self.feature_names_in_: np.ndarray | None = None
+
+    def clean_data(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        """Basic cleaning: remove duplicates."""
+        return data.unique(subset=cs.exclude(self.ROW_INDEX), keep="first", maintain_order=True)
+
+    def feature_engineer(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        """Feature engineering: example numerical features."""
+        return data.select(cs.numeric() | cs.by_name(self.ROW_INDEX, require_all=False))
+
+    def fit(self, X, y=None):
+        """Compute the mean and the post-imputation standard deviation of every feature."""
+        features = self.feature_engineer(self.clean_data(self.lazy(X)))
+        columns = [name for name in features.collect_schema().names() if name != self.ROW_INDEX]
+
+        # NaN counts as missing, as in SimpleImputer.
+        observed = [pl.col(name).cast(pl.Float64).fill_nan(None) for name in columns]
+        row = (
+            features.select(
+                pl.len().alias("rows"),
+                *[value.mean().alias(f"mean:{name}") for name, value in zip(columns, observed, strict=True)],
+                *[value.var(ddof=0).alias(f"var:{name}") for name, value in zip(columns, observed, strict=True)],
+                *[value.count().alias(f"count:{name}") for name, value in zip(columns, observed, strict=True)],
+            )
+            .collect()
+            .row(0, named=True)
+        )
+
+        self.statistics_ = {}
+        for name in columns:
+            count = row[f"count:{name}"]
+            if not count:
+                # SimpleImputer drops features without any observed value.
+                continue
+            # Imputed values sit at the mean, so they only add rows to the variance.
+            std = float(np.sqrt((row[f"var:{name}"] or 0.0) * count / row["rows"]))
+            self.statistics_[name] = (row[f"mean:{name}"], std if std > 10 * np.finfo(np.float64).eps else 1.0)
+        self.feature_names_in_ = np.array(columns, dtype=object)
+        return self
+
+    def transform_lazy(self, X: pl.LazyFrame) -> pl.LazyFrame:
+        """Impute and scale the fitted features."""
+        features = self.feature_engineer(self.clean_data(X))
+        scaled = [
+            ((pl.col(name).cast(pl.Float64).fill_nan(None).fill_null(mean) - mean) / std).alias(name)
+            for name, (mean, std) in self.statistics_.items()
+        ]
+        if self.ROW_INDEX in features.collect_schema().names():
+            scaled.append(pl.col(self.ROW_INDEX))
+        return features.select(scaled)
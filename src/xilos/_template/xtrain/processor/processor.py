@@ -1,18 +1,27 @@
+import numpy as np
 import pandas as pd
 from sklearn.impute import SimpleImputer
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 
 from ...xcore.xprocessor import DataProcessor
+from .compaction import DtypeCompactor
 
 
 class ExampleProcessor(DataProcessor):
-    """Example concrete implementation of DataProcessor."""
+    """
+    Example concrete implementation of DataProcessor.
 
-    def __init__(self):
-        self.pipeline = Pipeline([("imputer", SimpleImputer(strategy="mean")), ("scaler", StandardScaler())])
+    With a `compactor`, every frame is first cast to the compact schema fitted on the training
+    data; the schema is saved with the processor, so serving applies the same dtypes.
+    """
 
-    def clean(self, data: pd.DataFrame) -> pd.DataFrame:
+    def __init__(self, compactor: DtypeCompactor | None = None):
+        self.compactor = compactor
+        # The imputer always returns a new array, which the scaler can then scale in place.
+        self.pipeline = Pipeline([("imputer", SimpleImputer(strategy="mean")), ("scaler", StandardScaler(copy=False))])
+
+    def clean_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """Basic cleaning: remove duplicates."""
         return data.drop_duplicates()
 
@@ -24,13 +33,91 @@ class ExampleProcessor(DataProcessor):
 
     def fit(self, X, y=None):
         """Fit the internal pipeline."""
-        X_clean = self.clean(X)
-        X_feat = self.feature_engineer(X_clean)
-        self.pipeline.fit(X_feat)
+        self.pipeline.fit(self._features(X, fit=True))
         return self
 
     def transform(self, X):
         """Transform data."""
-        X_clean = self.clean(X)
-        X_feat = self.feature_engineer(X_clean)
-        return pd.DataFrame(self.pipeline.transform(X_feat), columns=X_feat.columns)
+        X_feat = self._features(X)
+        return self._wrap(self.pipeline.transform(X_feat), X_feat)
+
+    def fit_transform(self, X, y=None, **fit_params):
+        """Fit the pipeline and transform the training data, cleaning and engineering it only once."""
+        X_feat = self._features(X, fit=True)
+        return self._wrap(self.pipeline.fit_transform(X_feat), X_feat)
+
+    def _features(self, X: pd.DataFrame, fit: bool = False) -> pd.DataFrame:
+        # Processors saved before compaction existed have no compactor attribute.
+        compactor = getattr(self, "compactor", None)
+        if compactor is None:
+            return self.feature_engineer(self.clean_data(X))
+
+        X = compactor.fit_transform(X) if fit else compactor.transform(X)
+        X_feat = self.feature_engineer(self.clean_data(X))
+        # Mixed narrow columns would otherwise be promoted to a float64 matrix by the pipeline.
+        return X_feat.astype(np.float32) if compactor.float32 else X_feat
+
+    def _wrap(self, values: np.ndarray, X_feat: pd.DataFrame) -> pd.DataFrame:
+        # The pipeline output is a fresh array: wrap it without another copy.
+        return pd.DataFrame(values, columns=self.pipeline.get_feature_names_out(), index=X_feat.index, copy=False)
+
+    def partial_fit(self, X, y=None):
+        """
+        Fit the pipeline incrementally, one chunk at a time.
+
+        Per-column row counts, observed counts, means and sums of squared deviations are
+        merged across chunks. The pipeline is then refitted on a two-row frame with the same
+        mean and post-imputation variance, which gives the imputer and scaler the statistics
+        of a single fit over every chunk seen so far. Duplicates are only dropped within a chunk.
+        A processor fitted with `fit` is updated from the statistics of its pipeline.
+        """
+        imputer = self.pipeline.named_steps["imputer"]
+        if imputer.strategy != "mean":
+            raise NotImplementedError("Incremental fitting requires mean imputation.")
+        if getattr(self, "_moments", None) is None and hasattr(imputer, "statistics_"):
+            self._moments = self._pipeline_moments()
+
+        # The schema is fixed by the first chunk; later chunks it cannot hold keep their dtypes.
+        X_feat = self._features(X, fit=getattr(self, "_moments", None) is None)
+        moments = getattr(self, "_moments", None)
+        if moments is None:
+            width = X_feat.shape[1]
+            moments = {"columns": list(X_feat.columns), "rows": 0, "observed": np.zeros(width)}
+            moments.update(mean=np.zeros(width), m2=np.zeros(width))
+
+        values = X_feat.reindex(columns=moments["columns"]).to_numpy(dtype=float)
+        batch_count = (~np.isnan(values)).sum(axis=0)
+        sums = np.nansum(values, axis=0)
+        batch_mean = np.divide(sums, batch_count, out=np.zeros_like(sums), where=batch_count > 0)
+        batch_m2 = np.nansum((values - batch_mean) ** 2, axis=0)
+
+        # Chan et al. pairwise update of the running mean and sum of squared deviations.
+        count = moments["observed"] + batch_count
+        delta = batch_mean - moments["mean"]
+        weight = np.divide(batch_count, count, out=np.zeros_like(sums), where=count > 0)
+        moments["mean"] = moments["mean"] + delta * weight
+        moments["m2"] = moments["m2"] + batch_m2 + delta**2 * moments["observed"] * weight
+        moments["observed"] = count
+        moments["rows"] += len(values)
+        self._moments = moments
+
+        # Imputed values sit at the mean, so the variance after imputation is m2 / rows.
+        mean = np.where(count > 0, moments["mean"], np.nan)
+        spread = np.sqrt(moments["m2"] / max(moments["rows"], 1))
+        self.pipeline.fit(pd.DataFrame([mean + spread, mean - spread], columns=moments["columns"]))
+        return self
+
+    def _pipeline_moments(self) -> dict:
+        """
+        Running moments equivalent to the fitted pipeline. The number of observed values per
+        column is not kept by the pipeline, so every row counts as observed.
+        """
+        imputer, scaler = self.pipeline.named_steps["imputer"], self.pipeline.named_steps["scaler"]
+        columns = list(imputer.feature_names_in_)
+        rows = int(np.max(scaler.n_samples_seen_))
+        kept = np.isin(columns, imputer.get_feature_names_out())
+
+        mean, m2 = np.zeros(len(columns)), np.zeros(len(columns))
+        mean[kept] = imputer.statistics_[kept]
+        m2[kept] = scaler.var_ * rows
+        return {"columns": columns, "rows": rows, "observed": np.where(kept, rows, 0.0), "mean": mean, "m2": m2}
@@ -0,0 +1,104 @@
+import json
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+import pandas as pd
+from loguru import logger
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV
+
+from ..config import ARTIFACTS_DIR, timestamp
+from .model import MLModel
+
+LEADERBOARD_COLUMNS = [
+    "iter",
+    "n_resources",
+    "rank_test_score",
+    "mean_test_score",
+    "std_test_score",
+    "mean_fit_time",
+    "params",
+]
+
+
+@dataclass
+class TuningResult:
+    best_params: dict[str, Any]
+    best_score: float
+    leaderboard_path: Path
+
+
+def _memmap(array: np.ndarray, folder: str, name: str) -> np.memmap:
+    """Dump an array to disk and reopen it read-only, so joblib workers map it instead of copying it."""
+    path = Path(folder) / f"{name}.mmap"
+    joblib.dump(np.ascontiguousarray(array), path)
+    return joblib.load(path, mmap_mode="r")
+
+
+def leaderboard(cv_results: dict[str, Any]) -> pd.DataFrame:
+    """Candidates of every halving round, latest round first, best rank first within a round."""
+    board = pd.DataFrame(cv_results)[LEADERBOARD_COLUMNS]
+    board["params"] = board["params"].map(lambda params: json.dumps(params, default=str, sort_keys=True))
+    return board.sort_values(["iter", "rank_test_score"], ascending=[False, True]).reset_index(drop=True)
+
+
+def tune(
+    model: MLModel,
+    X: pd.DataFrame,
+    y: pd.Series,
+    param_space: dict[str, list[Any]],
+    n_candidates: int,
+    cv: int,
+    factor: int = 3,
+    resource: str = "n_samples",
+    scoring: str | None = None,
+    n_jobs: int = -1,
+    random_state: int | None = None,
+    output_dir: str | Path = ARTIFACTS_DIR,
+) -> TuningResult:
+    """
+    Successive-halving random search with K-fold CV over a pool of worker processes.
+
+    Every round scores the surviving candidates on `factor` times more resource (samples or,
+    e.g., `n_estimators`) and keeps the best 1/`factor`. The training matrix is memory-mapped
+    so all workers share a single copy. The best parameters are set on `model.model` and a
+    leaderboard of all rounds is written to `output_dir`; the caller refits the model.
+    """
+    logger.info(f"Tuning {type(model.model).__name__}: {n_candidates} candidates, {cv}-fold CV, n_jobs={n_jobs}")
+
+    with tempfile.TemporaryDirectory(prefix="xtrain-tune-") as folder:
+        X_shared = _memmap(X.to_numpy(dtype=np.float64), folder, "X")
+        y_shared = _memmap(np.asarray(y), folder, "y")
+
+        search = HalvingRandomSearchCV(
+            estimator=model.model,
+            param_distributions=param_space,
+            n_candidates=n_candidates,
+            cv=cv,
+            factor=factor,
+            resource=resource,
+            min_resources="exhaust",
+            scoring=scoring,
+            n_jobs=n_jobs,
+            random_state=random_state,
+            refit=False,
+        )
+        search.fit(X_shared, y_shared)
+        del X_shared, y_shared
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    leaderboard_path = output_dir / f"{timestamp()}_leaderboard.csv"
+    leaderboard(search.cv_results_).to_csv(leaderboard_path, index=False)
+
+    model.model.set_params(**search.best_params_)
+    logger.info(f"Best score {search.best_score_:.4f} with {search.best_params_}; leaderboard at {leaderboard_path}")
+    return TuningResult(
+        best_params=search.best_params_,
+        best_score=float(search.best_score_),
+        leaderboard_path=leaderboard_path,
+    )
@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+
+import pytest
+
+# The template is imported from the source tree, as `xilos._template`.
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+# Settings are read once at import: point every artifact path at a scratch directory first.
+ARTIFACTS = Path(tempfile.mkdtemp(prefix="xilos-template-tests-"))
+os.environ.setdefault("MODEL_PATH", (ARTIFACTS / "model").as_posix())
+os.environ.setdefault("PROCESSOR_PATH", (ARTIFACTS / "processor").as_posix())
+os.environ.setdefault("MODEL_REPOSITORY_DIR", (ARTIFACTS / "models").as_posix())
+os.environ.setdefault("ARTIFACT_POLL_SECONDS", "0.05")
+
+
+def pytest_configure(config):
+    from helpers import install_local_provider
+
+    install_local_provider()
+
+
+@pytest.fixture(scope="session")
+def served_artifacts():
+    """Train the example processor and a model, and save them where the registry serves them from."""
+    from helpers import LogisticModel, make_frame
+
+    from xilos._template.config import project_config
+    from xilos._template.xtrain.processor.processor import ExampleProcessor
+
+    frame = make_frame()
+    processor = ExampleProcessor()
+    X = processor.fit_transform(frame)
+    model = LogisticModel()
+    model.fit(X, (frame.loc[X.index, "b"] > 0).astype(int))
+
+    processor.save(project_config.PROCESSOR_PATH)
+    model.save(project_config.MODEL_PATH)
+    return frame, processor, model
+
+
+@pytest.fixture
+def client(served_artifacts):
+    """A test client of the serving app, with its lifespan running."""
+    from fastapi.testclient import TestClient
+
+    from xilos._template.xserve.main import app
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        with TestClient(app) as client:
+            yield client
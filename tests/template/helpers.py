@@ -0,0 +1,65 @@
+"""Shared test doubles and data for the template tests."""
+
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from xilos._template.config import project_config
+from xilos._template.xcore.xstore import DataStorage, DataTable
+from xilos._template.xtrain.model import MLModel
+
+
+class LocalStorage(DataStorage):
+    def download_object(self, cloud_path: str, file_path: str) -> None:
+        Path(file_path).write_bytes(Path(cloud_path).read_bytes())
+
+    def store_object(self, file_path: str, cloud_path: str) -> None:
+        Path(cloud_path).write_bytes(Path(file_path).read_bytes())
+
+
+class MemoryTable(DataTable):
+    def __init__(self, config=None) -> None:
+        super().__init__(config)
+        self.rows: list = []
+
+    def query(self, source: str, query: str | None = None, store: bool = True):
+        raise NotImplementedError
+
+    def append(self, data, destination: str) -> None:
+        self.rows.append((destination, data))
+
+    def create_table(self, data, destination: str) -> None:
+        pass
+
+
+def install_local_provider() -> None:
+    """Register a local provider under the GCP provider module names.
+
+    The registry resolves its cloud provider on import; the cloud SDKs are not needed to test serving.
+    """
+    settings = types.ModuleType("xilos._template.xgcp.settings")
+    settings.gcp_config = project_config
+    storage = types.ModuleType("xilos._template.xgcp.storage")
+    storage.GCSStorage = LocalStorage
+    storage.BigQueryFetcher = MemoryTable
+    sys.modules.setdefault(settings.__name__, settings)
+    sys.modules.setdefault(storage.__name__, storage)
+
+
+class LogisticModel(MLModel):
+    def _build_model(self, **kwargs):
+        return LogisticRegression()
+
+    def fit(self, x, y) -> None:
+        self.train(x, y)
+
+
+def make_frame(rows: int = 200, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({"a": rng.normal(size=rows), "b": rng.normal(size=rows), "c": rng.integers(0, 5, rows)})
+    frame.loc[::7, "a"] = np.nan
+    return frame
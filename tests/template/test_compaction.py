@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from xilos._template.xtrain.processor.compaction import DtypeCompactor
+
+
+def test_integers_get_the_narrowest_width_of_their_signedness():
+    frame = pd.DataFrame(
+        {
+            "signed": np.array([-3, 100], dtype=np.int64),
+            "unsigned": np.array([0, 200], dtype=np.uint64),
+            "wide": np.array([0, 70_000], dtype=np.uint32),
+        }
+    )
+
+    compacted = DtypeCompactor().fit_transform(frame)
+
+    assert compacted.dtypes.to_dict() == {
+        "signed": np.dtype(np.int8),
+        "unsigned": np.dtype(np.uint8),
+        "wide": np.dtype(np.uint32),
+    }
+    assert compacted.astype(np.int64).equals(frame.astype(np.int64))
+
+
+def test_unsigned_values_beyond_int64_keep_their_dtype():
+    frame = pd.DataFrame({"id": np.array([0, np.iinfo(np.uint64).max], dtype=np.uint64)})
+
+    compacted = DtypeCompactor().fit_transform(frame)
+
+    assert compacted["id"].dtype == np.uint64
+    assert compacted.equals(frame)
+
+
+def test_mixed_type_text_column_is_left_as_object():
+    frame = pd.DataFrame({"mixed": pd.Series(["a", 1, "a", 1, "a", 1], dtype=object), "text": ["x", "y"] * 3})
+
+    compactor = DtypeCompactor().fit(frame)
+    compacted = compactor.transform(frame)
+
+    assert "mixed" not in compactor.schema_
+    assert compacted["mixed"].dtype == object
+    assert isinstance(compacted["text"].dtype, pd.CategoricalDtype)
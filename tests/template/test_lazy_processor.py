@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+from helpers import make_frame
+
+from xilos._template.xtrain.processor.lazy import PolarsExampleProcessor
+from xilos._template.xtrain.processor.processor import ExampleProcessor
+
+# The all-missing column is dropped by both processors; sklearn warns about it.
+pytestmark = pytest.mark.filterwarnings("ignore:Skipping features without any observed values")
+
+
+def _training_frame() -> pd.DataFrame:
+    frame = make_frame(rows=300, seed=1)
+    frame["text"] = "x"
+    frame["empty"] = np.nan
+    # Duplicated rows must be dropped by both processors before fitting.
+    return pd.concat([frame, frame.iloc[:40]], ignore_index=True)
+
+
+def test_lazy_processor_matches_the_pandas_processor():
+    train = _training_frame()
+    pandas_processor = ExampleProcessor().fit(train)
+    polars_processor = PolarsExampleProcessor().fit(pl.from_pandas(train))
+
+    requests = train.iloc[[5, 5, 7, 300, 11]].set_axis([50, 51, 52, 53, 54])
+    expected = pandas_processor.transform(requests)
+    actual = polars_processor.transform(requests)
+
+    assert list(actual.columns) == list(expected.columns) == ["a", "b", "c"]
+    assert actual.index.equals(expected.index)
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-12, atol=1e-12)
+
+
+def test_lazy_processor_gives_polars_output_for_polars_input():
+    train = _training_frame()
+    processor = PolarsExampleProcessor().fit(train)
+
+    lazy = processor.transform(pl.from_pandas(train).lazy())
+    eager = processor.transform(train)
+
+    assert isinstance(lazy, pl.DataFrame)
+    np.testing.assert_allclose(lazy.to_numpy(), eager.to_numpy())
@@ -0,0 +1,126 @@
+import copy
+import shutil
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from xilos._template.config import project_config
+from xilos._template.registry import ModelRepository, ProviderRegistry, ResidentArtifact, registry
+from xilos._template.xcore.xmodel import version_key
+from xilos._template.xtrain.main import _latest_version
+from xilos._template.xtrain.model import ServingModel
+from xilos._template.xtrain.processor.processor import ExampleProcessor
+
+
+def test_registry_serves_saved_model(served_artifacts):
+    frame, processor, model = served_artifacts
+
+    registry.refresh()
+
+    served = registry.model_artifact.value
+    assert isinstance(served, ServingModel)
+    expected = model.predict(processor.transform(frame))
+    assert np.array_equal(served.predict(registry.processor_artifact.value.transform(frame)), expected)
+
+
+def test_failed_load_is_retried_only_after_the_file_changes(tmp_path):
+    path = tmp_path / "model"
+    path.write_bytes(b"not a pickle")
+    calls = []
+
+    def loader(p):
+        calls.append(p)
+        raise ValueError("corrupt artifact")
+
+    artifact = ResidentArtifact("model", path.as_posix(), loader)
+    assert artifact.refresh() is False
+    assert artifact.refresh() is False
+    assert len(calls) == 1
+
+    path.write_bytes(b"still not a pickle")
+    assert artifact.refresh() is False
+    assert len(calls) == 2
+
+
+def test_predict_serves_the_saved_model(client, served_artifacts):
+    frame, processor, model = served_artifacts
+    rows = frame.head(5)
+
+    assert client.get("/ready").status_code == 200
+    response = client.post("/predict", json={"data": rows.astype(object).where(rows.notna(), None).to_dict("records")})
+
+    assert response.status_code == 200
+    assert response.json()["predictions"] == model.predict(processor.transform(rows)).tolist()
+
+
+def test_cached_predict_with_duplicate_rows(client, served_artifacts, monkeypatch):
+    from xilos._template.xserve import main
+    from xilos._template.xserve.cache import PredictionCache
+
+    frame = served_artifacts[0]
+    rows = pd.concat([frame.iloc[[1]], frame.iloc[[1]], frame.iloc[[2]]]).to_dict("records")
+    monkeypatch.setattr(main, "cache", None)
+    uncached = client.post("/predict", json={"data": rows})
+    monkeypatch.setattr(main, "cache", PredictionCache(max_bytes=1024**2, ttl_seconds=60))
+
+    # Scored cold, then served from the cache: both match the uncached request.
+    for _ in range(2):
+        response = client.post("/predict", json={"data": rows})
+        assert response.status_code == 200
+        assert response.json()["predictions"] == uncached.json()["predictions"]
+    assert len(uncached.json()["predictions"]) == 2
+
+
+def test_latest_compares_version_numbers_numerically(tmp_path):
+    for version in ["9", "10", "v2", "v10", ".11.tmp"]:
+        (tmp_path / "model" / version).mkdir(parents=True)
+        (tmp_path / "model" / version / "model").write_bytes(b"")
+    repository = ModelRepository(tmp_path, model_loader=None, processor_loader=None, budget_bytes=0)
+
+    assert repository.resolve("model", "latest") == ("model", "v10")
+    assert _latest_version(tmp_path / "model").name == "v10"
+    assert sorted(["9", "10", "20240101_1"], key=version_key) == ["9", "10", "20240101_1"]
+
+
+def test_resident_latest_is_served_without_touching_disk(tmp_path, monkeypatch):
+    (tmp_path / "model" / "1").mkdir(parents=True)
+    (tmp_path / "model" / "1" / "model").write_bytes(b"")
+    repository = ModelRepository(tmp_path, model_loader=str, processor_loader=None, budget_bytes=1024)
+
+    assert repository.get("model", "latest").version == "1"
+    with monkeypatch.context() as patch:
+        patch.setattr(repository, "resolve", None)
+        assert repository.get("model", "latest").version == "1"
+
+    (tmp_path / "model" / "2").mkdir()
+    (tmp_path / "model" / "2" / "model").write_bytes(b"")
+    assert repository.get("model", "latest").version == "1"
+    repository.refresh_aliases()
+    assert repository.get("model", "latest").version == "2"
+    repository.shutdown()
+
+
+def test_reload_listeners_only_run_for_the_artifacts_they_watch(served_artifacts, tmp_path, monkeypatch):
+    shadow_path = tmp_path / "shadow_model"
+    shutil.copyfile(project_config.MODEL_PATH, shadow_path)
+    monkeypatch.setattr(project_config, "SHADOW_MODEL_PATH", shadow_path.as_posix())
+    providers = ProviderRegistry(
+        model=ServingModel,
+        processor=ExampleProcessor,
+        storage_provider=registry.storage_provider,
+        table_provider=registry.table_provider,
+    )
+    calls = {"primary": 0, "shadow": 0}
+    providers.add_reload_listener(lambda: calls.__setitem__("primary", calls["primary"] + 1))
+    providers.add_reload_listener(
+        lambda: calls.__setitem__("shadow", calls["shadow"] + 1), artifacts=[providers.shadow_model_artifact]
+    )
+
+    assert providers.refresh()
+    assert calls == {"primary": 1, "shadow": 1}
+
+    _, _, model = served_artifacts
+    joblib.dump(copy.deepcopy(model.model).set_params(C=2.0), shadow_path)
+    assert providers.refresh()
+    assert calls == {"primary": 1, "shadow": 2}
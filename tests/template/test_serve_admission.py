@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from xilos._template.xserve import main
+from xilos._template.xserve.admission import DEADLINE_HEADER, AdmissionController
+
+
+@pytest.fixture
+def busy(monkeypatch):
+    """Admission with its single inference slot taken."""
+
+    def install(max_queue: int) -> AdmissionController:
+        admission = AdmissionController(max_concurrency=1, max_queue=max_queue, queue_timeout_s=10, retry_after_s=2)
+        # An uncontended acquire completes without waiting, so it needs no running loop of the app.
+        asyncio.run(admission._semaphore.acquire())
+        monkeypatch.setattr(main, "admission", admission)
+        return admission
+
+    return install
+
+
+def _rows(served_artifacts):
+    return served_artifacts[0].iloc[1:4].to_dict("records")
+
+
+def test_full_queue_is_rejected_with_retry_after(client, served_artifacts, busy):
+    admission = busy(max_queue=0)
+
+    response = client.post("/predict", json={"data": _rows(served_artifacts)})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert admission.stats()["rejected"] == 1
+
+
+def test_deadline_expiring_in_the_queue_is_rejected(client, served_artifacts, busy):
+    admission = busy(max_queue=1)
+
+    response = client.post("/predict", json={"data": _rows(served_artifacts)}, headers={DEADLINE_HEADER: "50"})
+
+    assert response.status_code == 504
+    assert admission.stats()["waiting"] == 0
+
+
+def test_admitted_request_is_scored(client, served_artifacts, monkeypatch):
+    admission = AdmissionController(max_concurrency=1, max_queue=0, queue_timeout_s=10, retry_after_s=2)
+    monkeypatch.setattr(main, "admission", admission)
+
+    response = client.post("/predict", json={"data": _rows(served_artifacts)})
+
+    assert response.status_code == 200
+    assert admission.stats()["in_flight"] == 0
@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from xilos._template.xserve.batching import MicroBatcher, PendingRequest
+from xilos._template.xserve.inference import run_inference
+
+
+@pytest.fixture
+def scorer(served_artifacts):
+    frame, processor, model = served_artifacts
+    calls = []
+
+    def infer(data):
+        calls.append(len(data))
+        return run_inference(data, model, processor, with_index=True)
+
+    def alone(data):
+        return run_inference(data, model, processor)
+
+    return frame, infer, alone, calls
+
+
+def _execute(infer, *requests):
+    batch = [PendingRequest(request_id=str(i), data=data) for i, data in enumerate(requests)]
+    MicroBatcher(infer, max_rows=100, max_wait_ms=1)._execute(batch)
+    return [item.future.result() for item in batch]
+
+
+def test_rows_repeated_across_requests_are_scored_once(scorer):
+    frame, infer, alone, calls = scorer
+    first, second = frame.iloc[[1, 2]], frame.iloc[[2, 3]]
+
+    results = _execute(infer, first, second)
+
+    assert calls == [4]
+    assert np.array_equal(results[0], alone(first))
+    assert np.array_equal(results[1], alone(second))
+
+
+def test_rows_repeated_within_a_request_are_dropped_as_when_scored_alone(scorer):
+    frame, infer, alone, calls = scorer
+    first, second = frame.iloc[[1, 1, 2]], frame.iloc[[1]]
+
+    results = _execute(infer, first, second)
+
+    assert calls == [4]
+    assert len(results[0]) == 2
+    assert np.array_equal(results[0], alone(first))
+    assert np.array_equal(results[1], alone(second))
+
+
+def test_unmappable_predictions_fall_back_to_scoring_each_request():
+    calls = []
+
+    def infer(data):
+        calls.append(len(data))
+        predictions = np.arange(len(data))
+        # A processor that drops a row and resets the index cannot be split back.
+        return (predictions[:-1], None) if len(data) > 2 else (predictions, None)
+
+    results = _execute(infer, pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]}))
+
+    assert calls == [3, 2, 1]
+    assert [result.tolist() for result in results] == [[0, 1], [0]]
+
+
+def test_batches_are_scored_concurrently_by_the_workers():
+    # Each call waits for the other: this only completes when both batches are scored at once.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def infer(data):
+        barrier.wait()
+        return np.asarray(data["a"]), None
+
+    batcher = MicroBatcher(infer, max_rows=1, max_wait_ms=1, workers=2)
+    batcher.start()
+    try:
+        futures = [batcher.submit(str(i), pd.DataFrame({"a": [i]})) for i in range(2)]
+        assert [future.result(timeout=10).tolist() for future in futures] == [[0], [1]]
+    finally:
+        batcher.stop()
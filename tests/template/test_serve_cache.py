@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from xilos._template.xserve.cache import PredictionCache
+
+
+@pytest.fixture
+def cache():
+    return PredictionCache(max_bytes=1024**2, ttl_seconds=60)
+
+
+def test_duplicate_rows_are_scored_once_and_dropped(cache):
+    df = pd.DataFrame({"a": [1.0, 1.0, 2.0], "b": [3.0, 3.0, 4.0]})
+
+    lookup = cache.lookup(df, version=1)
+    assert lookup.missed.tolist() == [True, True, True]
+    assert lookup.unique.tolist() == [True, False, True]
+
+    predictions = cache.fill(lookup, np.array([10, 20]))
+    assert predictions.tolist() == [10, 20]
+    assert cache.stats()["entries"] == 2
+
+
+def test_partial_hit_with_duplicate_misses(cache):
+    cache.fill(cache.lookup(pd.DataFrame({"a": [1.0]}), version=1), np.array([10]))
+
+    lookup = cache.lookup(pd.DataFrame({"a": [2.0, 1.0, 2.0]}), version=1)
+    assert lookup.missed.tolist() == [True, False, True]
+    assert lookup.unique.tolist() == [True, False, False]
+
+    assert cache.fill(lookup, np.array([20])).tolist() == [20, 10]
+
+
+def test_repeated_hits_are_dropped(cache):
+    cache.fill(cache.lookup(pd.DataFrame({"a": [1.0]}), version=1), np.array([10]))
+
+    lookup = cache.lookup(pd.DataFrame({"a": [1.0, 1.0]}), version=1)
+    assert cache.fill(lookup, np.array([])).tolist() == [10]
+
+
+def test_misaligned_predictions_are_not_cached(cache):
+    lookup = cache.lookup(pd.DataFrame({"a": [1.0, 2.0]}), version=1)
+
+    assert cache.fill(lookup, np.array([10])) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_new_version_invalidates(cache):
+    cache.fill(cache.lookup(pd.DataFrame({"a": [1.0]}), version=1), np.array([10]))
+
+    lookup = cache.lookup(pd.DataFrame({"a": [1.0]}), version=2)
+    assert lookup.missed.tolist() == [True]
+    assert cache.stats()["invalidations"] == 1
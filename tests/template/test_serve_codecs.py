@@ -0,0 +1,58 @@
+import gzip
+import zlib
+
+import pytest
+import zstandard
+from fastapi import HTTPException
+
+from xilos._template.xserve.codecs import decompress, decompressor
+
+BODY = b'{"data": [{"a": 1.0}]}' * 1_000
+
+
+@pytest.mark.parametrize(
+    ("encoding", "compress"),
+    [("identity", bytes), ("gzip", gzip.compress), ("zstd", zstandard.ZstdCompressor().compress)],
+)
+def test_bodies_within_the_limit_are_decoded(encoding, compress):
+    assert decompress(compress(BODY), encoding, max_bytes=len(BODY)) == BODY
+
+
+@pytest.mark.parametrize(
+    ("encoding", "compress"),
+    [("identity", bytes), ("gzip", gzip.compress), ("zstd", zstandard.ZstdCompressor().compress)],
+)
+def test_bodies_expanding_beyond_the_limit_are_rejected(encoding, compress):
+    with pytest.raises(HTTPException) as error:
+        decompress(compress(BODY), encoding, max_bytes=len(BODY) - 1)
+    assert error.value.status_code == 413
+
+
+def test_gzip_bomb_is_not_expanded_past_the_limit():
+    bomb = gzip.compress(b"\0" * 32 * 1024**2)
+    codec = decompressor("gzip")
+
+    with pytest.raises(HTTPException):
+        codec.decompress(bomb, 1024**2)
+    # Most of the input was never inflated.
+    assert len(codec._codec.unconsumed_tail) > len(bomb) // 2
+
+
+def test_corrupt_body_is_rejected_as_invalid():
+    with pytest.raises(HTTPException) as error:
+        decompress(b"not gzip", "gzip", max_bytes=1024)
+    assert error.value.status_code == 422
+    assert isinstance(error.value.__cause__, zlib.error)
+
+
+def test_predict_rejects_a_compressed_body_over_the_limit(client, monkeypatch):
+    from xilos._template.xserve import main
+
+    monkeypatch.setattr(main, "max_body_bytes", 1024)
+    body = gzip.compress(b'{"data": [' + b",".join([b'{"a": 1.0, "b": 2.0, "c": 3}'] * 1_000) + b"]}")
+
+    response = client.post(
+        "/predict", content=body, headers={"content-type": "application/json", "content-encoding": "gzip"}
+    )
+
+    assert response.status_code == 413
@@ -0,0 +1,89 @@
+import copy
+
+import numpy as np
+import pytest
+
+from xilos._template.xserve import main
+from xilos._template.xserve.compiled import CompiledPredictor
+from xilos._template.xserve.inference import run_compiled, run_inference
+from xilos._template.xtrain.processor.processor import ExampleProcessor
+
+
+def test_compiled_scores_the_rows_the_pipeline_scores(served_artifacts):
+    frame, processor, model = served_artifacts
+    rows = frame.iloc[[1, 1, 2]]
+
+    predictor = CompiledPredictor.compile(model, processor)
+    predictions, index = run_compiled(rows, predictor, with_index=True)
+
+    expected, expected_index = run_inference(rows, model, processor, with_index=True)
+    assert len(predictions) == 2
+    assert np.array_equal(predictions, expected)
+    assert index.equals(expected_index)
+
+
+class _NamesFromClass:
+    """Estimator wrapper whose feature names live on the class, so they cannot be deleted from the instance."""
+
+    def __init__(self, estimator):
+        self.estimator = estimator
+
+    @property
+    def feature_names_in_(self):
+        return self.estimator.feature_names_in_
+
+    def predict(self, X):
+        return self.estimator.predict(X)
+
+
+@pytest.mark.filterwarnings("ignore:X does not have valid feature names")
+def test_compile_keeps_feature_names_it_cannot_delete(served_artifacts):
+    frame, processor, model = served_artifacts
+    wrapped = copy.copy(model)
+    wrapped.model = _NamesFromClass(model.model)
+
+    predictor = CompiledPredictor.compile(wrapped, processor)
+
+    assert np.array_equal(predictor.predict(frame.head(5)), model.predict(processor.transform(frame.head(5))))
+
+
+def test_compile_failure_falls_back_to_the_pipeline(served_artifacts, monkeypatch):
+    def fail(model, processor):
+        raise AttributeError("feature_names_in_")
+
+    main.registry.refresh()
+    monkeypatch.setattr(CompiledPredictor, "compile", fail)
+    monkeypatch.setattr(main, "compiled", object())
+
+    main._compile()
+
+    assert main.compiled is None
+
+
+class _RatioProcessor(ExampleProcessor):
+    def feature_engineer(self, data):
+        features = super().feature_engineer(data)
+        return features.assign(ratio=features["a"] / (features["c"] + 1))
+
+
+def test_processor_with_derived_features_is_not_compiled(served_artifacts):
+    frame, _, model = served_artifacts
+    processor = _RatioProcessor()
+    processor.fit(frame)
+
+    with pytest.raises(ValueError, match="derives its own features"):
+        CompiledPredictor.compile(model, processor)
+
+
+def test_compiled_failure_falls_back_to_the_pipeline(served_artifacts, monkeypatch):
+    frame, processor, model = served_artifacts
+    predictor = CompiledPredictor.compile(model, processor)
+    monkeypatch.setattr(main, "compiled", predictor)
+
+    def missing_column(data):
+        raise ValueError("Missing feature column 'a'")
+
+    monkeypatch.setattr(predictor, "to_array", missing_column)
+
+    predictions = main._infer(frame.head(5), model, processor)
+    assert np.array_equal(predictions, run_inference(frame.head(5), model, processor))
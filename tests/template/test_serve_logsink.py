@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from xilos._template.xserve import logsink
+from xilos._template.xserve.logsink import PredictionLogSink
+
+
+def _payload(rows: int) -> dict:
+    return {
+        "request_id": "r",
+        "timestamp": "2026-01-01T00:00:00",
+        "model": "default",
+        "input": pd.DataFrame({"a": np.arange(rows, dtype=float)}),
+        "status": "success",
+        "output": np.arange(rows),
+        "error": None,
+    }
+
+
+def _sink(frames: list, **kwargs) -> PredictionLogSink:
+    return PredictionLogSink(frames.append, max_queue=100, batch_size=10, flush_seconds=1.0, **kwargs)
+
+
+def test_payloads_are_queued_as_a_bounded_sample():
+    frames = []
+    sink = _sink(frames, max_rows=5)
+
+    assert sink.submit(_payload(10_000))
+    sink.stop()
+
+    record = frames[0].row(0, named=True)
+    assert record["rows"] == "10000"
+    assert len(json.loads(record["input"])) == 5
+    assert json.loads(record["output"]) == [0, 1, 2, 3, 4]
+    assert sink.stats()["queued_bytes"] == 0
+
+
+def test_queue_is_bounded_by_bytes():
+    frames = []
+    sink = _sink(frames, max_rows=100, max_bytes=1_000)
+
+    assert sink.submit(_payload(50))
+    assert not sink.submit(_payload(50))
+    assert sink.stats()["dropped"] == 1
+
+    sink.stop()
+    assert sink.stats()["written"] == 1
+    assert sink.submit(_payload(50))
+
+
+def test_payloads_are_serialized_on_the_sink_thread(monkeypatch):
+    threads = []
+    serialize = logsink.to_log_record
+
+    def to_log_record(payload, max_rows):
+        threads.append(threading.current_thread().name)
+        return serialize(payload, max_rows)
+
+    monkeypatch.setattr(logsink, "to_log_record", to_log_record)
+    frames = []
+    sink = _sink(frames, max_rows=5)
+    sink.flush_seconds = 0.01
+    sink.start()
+
+    assert sink.submit(_payload(10_000))
+    assert threads == []
+    deadline = time.monotonic() + 5
+    while sink.stats()["written"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    sink.stop()
+
+    assert threads == ["xserve-log-sink"]
+    assert frames[0].row(0, named=True)["rows"] == "10000"
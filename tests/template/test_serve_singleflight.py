@@ -0,0 +1,73 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from xilos._template.xserve.inference import run_inference
+from xilos._template.xserve.singleflight import SingleFlight, request_key
+
+
+class CountingModel:
+    """Scores with the served artifacts and counts the inference calls."""
+
+    def __init__(self, model, processor) -> None:
+        self.model = model
+        self.processor = processor
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def predict(self, data):
+        self.calls += 1
+        # Hold the flight open until every caller has joined it.
+        await self.release.wait()
+        return run_inference(data, self.model, self.processor)
+
+
+def test_identical_concurrent_requests_run_inference_once(served_artifacts):
+    frame, processor, model = served_artifacts
+    rows = frame.iloc[1:4]
+
+    async def scenario():
+        flights = SingleFlight(max_keys=8)
+        counting = CountingModel(model, processor)
+        key = request_key("/predict", rows.to_json())
+        callers = [asyncio.create_task(flights.do(key, lambda: counting.predict(rows))) for _ in range(5)]
+        await asyncio.sleep(0)
+        counting.release.set()
+        results = await asyncio.gather(*callers)
+        return counting.calls, results, flights.stats()
+
+    calls, results, stats = asyncio.run(scenario())
+
+    assert calls == 1
+    assert [shared for _, shared in results] == [False, True, True, True, True]
+    for predictions, _ in results:
+        assert np.array_equal(predictions, run_inference(rows, model, processor))
+    assert stats == {"in_flight": 0, "leaders": 1, "shared": 4, "untracked": 0}
+
+
+def test_failure_reaches_every_waiter():
+    async def scenario():
+        flights = SingleFlight(max_keys=8)
+        release = asyncio.Event()
+        calls = 0
+
+        async def fail():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            raise ValueError("Missing feature column 'a'")
+
+        callers = [asyncio.create_task(flights.do(b"key", fail)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        return calls, results
+
+    calls, results = asyncio.run(scenario())
+
+    assert calls == 1
+    assert len(results) == 3
+    for error in results:
+        with pytest.raises(ValueError, match="Missing feature column"):
+            raise error
@@ -0,0 +1,65 @@
+import io
+import json
+
+import pyarrow as pa
+import pytest
+import zstandard
+
+from xilos._template.config import project_config
+
+
+def _ndjson(rows) -> bytes:
+    return rows.to_json(orient="records", lines=True).encode()
+
+
+def test_ndjson_stream_is_scored_in_chunks(client, served_artifacts, monkeypatch):
+    frame, processor, model = served_artifacts
+    monkeypatch.setattr(project_config, "SERVE_STREAM_CHUNK_ROWS", 3)
+    rows = frame.head(5)
+
+    response = client.post("/predict/stream", content=_ndjson(rows), headers={"content-type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    lines = [line for line in response.iter_lines() if line]
+    assert len(lines) == 2
+    predictions = [p for line in lines for p in json.loads(line)["predictions"]]
+    assert predictions == model.predict(processor.transform(rows)).tolist()
+
+
+def test_ndjson_line_over_the_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(project_config, "SERVE_STREAM_MAX_LINE_BYTES", 64)
+    body = b'{"a": "' + b"x" * 1_000 + b'"}'
+
+    response = client.post("/predict/stream", content=body, headers={"content-type": "application/x-ndjson"})
+
+    assert response.status_code == 413
+
+
+def test_arrow_stream_is_scored(client, served_artifacts):
+    frame, processor, model = served_artifacts
+    rows = frame.head(5)
+    sink = io.BytesIO()
+    table = pa.Table.from_pandas(rows, preserve_index=False)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    response = client.post(
+        "/predict/stream", content=sink.getvalue(), headers={"content-type": "application/vnd.apache.arrow.stream"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["predictions"] == model.predict(processor.transform(rows)).tolist()
+
+
+@pytest.mark.parametrize("content_type", ["application/x-ndjson", "application/vnd.apache.arrow.stream"])
+def test_stream_chunk_expanding_beyond_the_limit_is_rejected(client, monkeypatch, content_type):
+    from xilos._template.xserve import main
+
+    monkeypatch.setattr(main, "max_body_bytes", 1024)
+    body = zstandard.ZstdCompressor().compress(b"\0" * 1024**2)
+
+    response = client.post(
+        "/predict/stream", content=body, headers={"content-type": content_type, "content-encoding": "zstd"}
+    )
+
+    assert response.status_code == 413
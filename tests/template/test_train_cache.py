@@ -0,0 +1,57 @@
+import os
+
+import pandas as pd
+
+from xilos._template.xtrain.cache import MANIFEST, StageCache
+
+
+def _frame(values) -> dict:
+    return {"data": pd.DataFrame({"a": values})}
+
+
+def test_unversioned_download_is_recomputed_and_unchanged_content_hits_downstream(tmp_path):
+    data, calls = [[1, 2, 3]], []
+
+    def double(raw):
+        calls.append(raw)
+        return {"data": raw["data"] * 2}
+
+    def run():
+        cache = StageCache(tmp_path, code_version="v1")
+        raw = cache.run("download", lambda: _frame(data[0]), reuse=False)
+        return cache.run("double", double, inputs=(raw,))
+
+    run()
+    run()
+    assert len(calls) == 1
+
+    data[0] = [4, 5, 6]
+    result = run()
+    assert len(calls) == 2
+    assert result["data"]["a"].tolist() == [8, 10, 12]
+
+
+def test_least_recently_used_entries_are_evicted_above_the_size_limit(tmp_path):
+    first = StageCache(tmp_path, code_version="v1")
+    old = first.run("stage", lambda: _frame(range(1_000)), params=1)
+    os.utime(old.directory / MANIFEST, (0, 0))
+    size = sum(path.stat().st_size for path in old.directory.iterdir())
+
+    second = StageCache(tmp_path, code_version="v1", max_bytes=int(size * 1.5))
+    kept = second.run("stage", lambda: _frame(range(1_000)), params=2)
+    newest = second.run("stage", lambda: _frame(range(1_000)), params=3)
+
+    assert not old.directory.exists()
+    # Entries used by the running pipeline stay, even above the limit.
+    assert kept.directory.exists() and newest.directory.exists()
+
+
+def test_expired_entries_are_evicted(tmp_path):
+    old = StageCache(tmp_path, code_version="v1").run("stage", lambda: _frame([1]), params=1)
+    os.utime(old.directory / MANIFEST, (0, 0))
+
+    cache = StageCache(tmp_path, code_version="v1", max_age_seconds=86_400)
+    fresh = cache.run("stage", lambda: _frame([2]), params=2)
+
+    assert not old.directory.exists()
+    assert fresh.directory.exists()
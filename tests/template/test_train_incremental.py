@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+from helpers import LocalStorage, make_frame
+from sklearn.linear_model import SGDClassifier
+
+from xilos._template.config import project_config
+from xilos._template.xtrain.main import TRAINING_METADATA, run_incremental_training_pipeline
+from xilos._template.xtrain.model import MLModel
+from xilos._template.xtrain.processor.processor import ExampleProcessor
+
+
+class SGDModel(MLModel):
+    def _build_model(self, **kwargs):
+        return SGDClassifier(random_state=0)
+
+    def fit(self, x, y) -> None:
+        self.train(x, y)
+
+
+def _write_partition(source, day: int) -> None:
+    frame = make_frame(rows=50, seed=day)
+    frame["target"] = (frame["b"] > 0).astype(int)
+    directory = source / f"day={day}"
+    directory.mkdir(parents=True)
+    frame.to_parquet(directory / "part.parquet")
+
+
+def test_consecutive_runs_in_one_process_create_new_versions(tmp_path):
+    source, repository = tmp_path / "source", tmp_path / "models"
+    _write_partition(source, 1)
+
+    def retrain():
+        return run_incremental_training_pipeline(
+            data_storage=LocalStorage(project_config),
+            processor=ExampleProcessor(),
+            model=SGDModel(),
+            source=source.as_posix(),
+            target="target",
+            partition_column="day",
+            repository_dir=repository,
+            model_name="model",
+            batch_rows=20,
+        )
+
+    first = retrain()
+    _write_partition(source, 2)
+    second = retrain()
+
+    assert first is not None and second is not None and first != second
+    assert sorted(path.name for path in (repository / "model").iterdir()) == sorted([first.name, second.name])
+    metadata = pd.read_json(second / TRAINING_METADATA, typ="series")
+    assert metadata["parent"] == first.name
+    assert metadata["watermark"] == 2
+    assert np.isfinite(SGDModel.load(second / "model").model.coef_).all()
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+from helpers import LocalStorage, LogisticModel, MemoryTable, make_frame
+
+from xilos._template.config import project_config
+from xilos._template.xtrain.main import run_training_pipeline
+from xilos._template.xtrain.processor.processor import ExampleProcessor
+
+
+class CountingProcessor(ExampleProcessor):
+    def __init__(self):
+        super().__init__()
+        self.cleaned_rows: list[int] = []
+
+    def clean_data(self, data):
+        self.cleaned_rows.append(len(data))
+        return super().clean_data(data)
+
+
+@pytest.fixture
+def training_data(tmp_path, monkeypatch):
+    frame = make_frame(rows=100)
+    frame["target"] = (frame["b"] > 0).astype(int)
+    # Repeated rows must not end up in both the training and the test split.
+    frame = pd.concat([frame, frame.head(20)], ignore_index=True)
+    path = tmp_path / "train.parquet"
+    frame.to_parquet(path)
+
+    monkeypatch.setattr(project_config, "TRAIN_DATA_PATH", path.as_posix())
+    monkeypatch.setattr(project_config, "TRAIN_CACHE_DIR", (tmp_path / "cache").as_posix())
+    monkeypatch.setattr(project_config, "MODEL_PATH", (tmp_path / "model").as_posix())
+    monkeypatch.setattr(project_config, "PROCESSOR_PATH", (tmp_path / "processor").as_posix())
+    return frame
+
+
+def test_duplicates_are_dropped_before_the_split(training_data):
+    processor = CountingProcessor()
+
+    run_training_pipeline(LocalStorage(project_config), MemoryTable(project_config), processor, LogisticModel())
+
+    # The whole frame first, then the two splits of its 100 unique rows (fit_transform and transform).
+    assert processor.cleaned_rows[0] == 120
+    assert sorted(processor.cleaned_rows[1:]) == [20, 80]
@@ -0,0 +1,41 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from helpers import LogisticModel
+
+from xilos._template.xtrain.tuning import LEADERBOARD_COLUMNS, tune
+
+
+def test_tune_sets_the_best_params_and_writes_the_leaderboard(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({"a": rng.normal(size=240), "b": rng.normal(size=240)})
+    y = (X["a"] + 0.5 * X["b"] > 0).astype(int)
+    model = LogisticModel()
+
+    # A vanishing C leaves the model at chance level, which log loss tells apart.
+    result = tune(
+        model,
+        X,
+        y,
+        param_space={"C": [1e-6, 1.0]},
+        n_candidates=2,
+        cv=3,
+        factor=2,
+        scoring="neg_log_loss",
+        n_jobs=1,
+        random_state=0,
+        output_dir=tmp_path,
+    )
+
+    assert result.best_params == {"C": 1.0}
+    assert model.model.get_params()["C"] == 1.0
+
+    board = pd.read_csv(result.leaderboard_path)
+    assert result.leaderboard_path.parent == tmp_path
+    assert list(board.columns) == LEADERBOARD_COLUMNS
+    # Both candidates in the first round, the survivor in the second, latest round first.
+    assert board["iter"].tolist() == [1, 0, 0]
+    assert json.loads(board.loc[0, "params"]) == result.best_params
+    assert board.loc[0, "mean_test_score"] == pytest.approx(result.best_score)